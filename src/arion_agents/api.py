@@ -8,11 +8,11 @@ import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from functools import lru_cache
 import sqlalchemy as sa
 from sqlmodel import Session
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, Query, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, ValidationError, model_validator
@@ -129,6 +129,17 @@ _FORCE_DEBUG_LOGGING = os.getenv("DEBUG", "").strip().lower() in {
 }
 
 
+_HEALTH_POLL_INTERVAL_S = 0.25
+
+
+def _db_ping() -> None:
+    """Cheap connectivity probe; raises if the database cannot be reached."""
+    from arion_agents.db import engine
+
+    with engine.connect() as conn:
+        conn.execute(sa.text("SELECT 1"))
+
+
 @app.on_event("startup")
 async def _startup() -> None:
     _setup_file_logging()
@@ -142,9 +153,25 @@ async def _startup() -> None:
     await _ensure_queue_worker()
 
 
-@app.get("/health")
-async def health() -> dict:
-    return {"status": "ok"}
+@app.api_route("/health", methods=["GET", "HEAD"])
+async def health(wait: float = Query(default=0, ge=0, le=60)) -> dict:
+    """Liveness probe; with ``wait`` it long-polls until the database answers.
+
+    Returns 503 if the database is still unavailable once ``wait`` seconds pass.
+    """
+    if wait <= 0:
+        return {"status": "ok"}
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            await asyncio.to_thread(_db_ping)
+            return {"status": "ok"}
+        except Exception:
+            logging.getLogger(__name__).debug("Health database probe failed", exc_info=True)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise HTTPException(status_code=503, detail="database not ready")
+        await asyncio.sleep(min(_HEALTH_POLL_INTERVAL_S, remaining))
 
 
 class InvokeRequest(BaseModel):
@@ -264,6 +291,7 @@ class RunOnceRequest(BaseModel):
     experiment_iteration: int | None = None
     experiment_item_payload: dict | None = None
     max_steps: int | None = Field(default=None, ge=1)
+    stream: bool = False
 
     @model_validator(mode="after")
     def _require_target(cls, data: "RunOnceRequest"):
@@ -300,12 +328,64 @@ class RunBatchRequest(BaseModel):
         return data
 
 
-@app.post("/run")
-async def run_once(payload: RunOnceRequest) -> dict:
+@app.post("/run", response_model=None)
+async def run_once(payload: RunOnceRequest) -> dict | StreamingResponse:
     """One-step run: LLM decision → translate → execute → return result.
 
     Uses compiled prompt + constraints; enforces structured JSON via google-genai JSON mode.
+    With ``stream`` set, the response is newline-delimited JSON: one ``step`` line per
+    step event as it happens, then a single ``final`` (or ``error``) line.
     """
+    if payload.stream:
+        return _stream_run_once(payload)
+    return await _execute_run(payload)
+
+
+def _stream_run_once(payload: RunOnceRequest) -> StreamingResponse:
+    loop = asyncio.get_running_loop()
+    lines: asyncio.Queue[str | None] = asyncio.Queue()
+
+    def _on_step_event(env: Dict[str, Any]) -> None:
+        # Serialise on the worker thread: the loop keeps mutating entries after emitting them.
+        line = json.dumps({"type": "step", "event": env}, default=str) + "\n"
+        loop.call_soon_threadsafe(lines.put_nowait, line)
+
+    async def _produce() -> None:
+        try:
+            try:
+                out = await _execute_run(payload, on_step_event=_on_step_event)
+                line = {"type": "final", "result": out}
+            except HTTPException as exc:
+                line = {"type": "error", "status_code": exc.status_code, "detail": exc.detail}
+            lines.put_nowait(json.dumps(line, default=str) + "\n")
+        except Exception as exc:
+            logging.getLogger(__name__).exception("Error streaming run")
+            line = {"type": "error", "status_code": 500, "detail": str(exc)}
+            lines.put_nowait(json.dumps(line, default=str) + "\n")
+        finally:
+            # Always end the stream, even on cancellation, so the client is released.
+            lines.put_nowait(None)
+
+    # Keep a strong reference so the run (and its persistence) completes even if the
+    # client disconnects mid-stream.
+    task = loop.create_task(_produce())
+    _streaming_runs.add(task)
+    task.add_done_callback(_streaming_runs.discard)
+
+    async def _ndjson():
+        while (line := await lines.get()) is not None:
+            yield line
+
+    return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
+
+_streaming_runs: set[asyncio.Task] = set()
+
+
+async def _execute_run(
+    payload: RunOnceRequest,
+    on_step_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> dict:
     # Per-run log record
     run_started = time.time()
     run_ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
@@ -365,6 +445,7 @@ async def run_once(payload: RunOnceRequest) -> dict:
             max_steps=max_steps,
             model=payload.model,
             debug=debug_enabled,
+            on_step_event=on_step_event,
         )
         if out is None:
             out = {}
@@ -570,7 +651,7 @@ async def _process_queue_record(record_id: int) -> None:
 
     try:
         request = RunOnceRequest(**payload)
-        result = await run_once(request)
+        result = await _execute_run(request)
         final_section = result.get("final") if isinstance(result, dict) else None
         final_status = (
             final_section.get("status") if isinstance(final_section, dict) else None
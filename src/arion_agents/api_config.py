@@ -595,10 +595,24 @@ def delete_network(network_id: int, db: Session = Depends(get_db_dep)):
     db.commit()
 
 
-@router.post("/networks/{network_id}/tools", response_model=List[str])
+class NetworkToolRef(BaseModel):
+    id: int
+    key: str
+    created: bool
+
+
+@router.post("/networks/{network_id}/tools", response_model=List[NetworkToolRef])
 def add_tools_to_network(
     network_id: int, payload: SetTools, db: Session = Depends(get_db_dep)
 ):
+    refs = _add_tools_to_network(db, network_id, payload)
+    db.commit()
+    return refs
+
+
+def _add_tools_to_network(
+    db: Session, network_id: int, payload: SetTools
+) -> List[NetworkToolRef]:
     net = db.get(Network, network_id)
     if not net:
         raise HTTPException(status_code=404, detail="network not found")
@@ -614,7 +628,8 @@ def add_tools_to_network(
             status_code=400, detail=f"unknown tool keys: {', '.join(missing)}"
         )
 
-    created_keys: List[str] = []
+    # Network-local ids for every requested key, so callers need no follow-up lookup.
+    refs: List[Tuple[NetworkTool, bool]] = []
     for k in keys:
         g = found[k]
         # Enforce that the global tool includes agent_params_json_schema
@@ -637,6 +652,7 @@ def add_tools_to_network(
             logger.debug(
                 "NetworkTool exists; skipping: network_id=%s key=%s", network_id, k
             )
+            refs.append((exists, False))
             continue
         nt = NetworkTool(
             network_id=network_id,
@@ -656,9 +672,12 @@ def add_tools_to_network(
             g.key,
         )
         db.add(nt)
-        created_keys.append(g.key)
-    db.commit()
-    return created_keys
+        refs.append((nt, True))
+    db.flush()
+    return [
+        NetworkToolRef(id=nt.id, key=nt.key, created=created)  # type: ignore[arg-type]
+        for nt, created in refs
+    ]
 
 
 class NetworkToolOut(BaseModel):
@@ -749,6 +768,12 @@ def delete_network_tool(network_id: int, key: str, db: Session = Depends(get_db_
 def create_agent(
     network_id: int, payload: AgentCreate, db: Session = Depends(get_db_dep)
 ):
+    out = _create_agent(db, network_id, payload)
+    db.commit()
+    return out
+
+
+def _create_agent(db: Session, network_id: int, payload: AgentCreate) -> AgentOut:
     if not db.get(Network, network_id):
         raise HTTPException(status_code=404, detail="network not found")
     if db.exec(
@@ -774,7 +799,6 @@ def create_agent(
     )
     db.add(agent)
     _validate_network_or_raise(db, network_id)
-    db.commit()
     db.refresh(agent)
     prompts_map, default_map = _load_compiled_agent_metadata(db, [network_id])
     return _resolve_agent_out(
@@ -877,6 +901,14 @@ def delete_agent(network_id: int, agent_id: int, db: Session = Depends(get_db_de
 def set_agent_tools(
     network_id: int, agent_id: int, payload: SetTools, db: Session = Depends(get_db_dep)
 ):
+    out = _set_agent_tools(db, network_id, agent_id, payload)
+    db.commit()
+    return out
+
+
+def _set_agent_tools(
+    db: Session, network_id: int, agent_id: int, payload: SetTools
+) -> AgentOut:
     a = db.get(Agent, agent_id)
     if not a or a.network_id != network_id:
         raise HTTPException(status_code=404, detail="agent not found")
@@ -900,7 +932,7 @@ def set_agent_tools(
     else:
         a.equipped_tools = []
     db.add(a)
-    db.commit()
+    db.flush()
     db.refresh(a)
     prompts_map, default_map = _load_compiled_agent_metadata(db, [network_id])
     return _resolve_agent_out(
@@ -917,6 +949,14 @@ def set_agent_routes(
     payload: SetRoutes,
     db: Session = Depends(get_db_dep),
 ):
+    out = _set_agent_routes(db, network_id, agent_id, payload)
+    db.commit()
+    return out
+
+
+def _set_agent_routes(
+    db: Session, network_id: int, agent_id: int, payload: SetRoutes
+) -> AgentOut:
     a = db.get(Agent, agent_id)
     if not a or a.network_id != network_id:
         raise HTTPException(status_code=404, detail="agent not found")
@@ -940,7 +980,7 @@ def set_agent_routes(
     else:
         a.allowed_routes = []
     db.add(a)
-    db.commit()
+    db.flush()
     db.refresh(a)
     prompts_map, default_map = _load_compiled_agent_metadata(db, [network_id])
     return _resolve_agent_out(
@@ -1050,6 +1090,14 @@ class PublishResponse(BaseModel):
 def compile_and_publish(
     network_id: int, payload: PublishRequest, db: Session = Depends(get_db_dep)
 ):
+    out = _compile_and_publish(db, network_id, payload)
+    db.commit()
+    return out
+
+
+def _compile_and_publish(
+    db: Session, network_id: int, payload: PublishRequest
+) -> PublishResponse:
     net = db.get(Network, network_id)
     if not net:
         raise HTTPException(status_code=404, detail="network not found")
@@ -1068,8 +1116,7 @@ def compile_and_publish(
         notes=payload.notes,
     )
     db.add(ver)
-    db.commit()
-    db.refresh(ver)
+    db.flush()
 
     graph = _compile_snapshot(db, network_id, ver.id)  # type: ignore[arg-type]
     snap = CompiledSnapshot(network_version_id=ver.id, compiled_graph=graph)
@@ -1077,7 +1124,7 @@ def compile_and_publish(
     # Update network pointer
     net.current_version_id = ver.id
     db.add(net)
-    db.commit()
+    db.flush()
     return PublishResponse(
         id=ver.id, network_id=network_id, version=ver.version, published_at=None
     )
@@ -1098,3 +1145,60 @@ def get_current_snapshot(network_id: int, db: Session = Depends(get_db_dep)):
     if not snap:
         raise HTTPException(status_code=404, detail="snapshot not found")
     return snap.compiled_graph or {}
+
+
+class AgentApplySpec(AgentCreate):
+    tool_keys: List[str] = Field(default_factory=list)
+    route_keys: List[str] = Field(default_factory=list)
+
+
+class NetworkApplyRequest(SQLModel):
+    tool_keys: List[str] = Field(default_factory=list)
+    agents: List[AgentApplySpec] = Field(default_factory=list)
+    publish: Optional[PublishRequest] = None
+
+
+class NetworkApplyResponse(BaseModel):
+    tools: List[NetworkToolRef]
+    agents: List[AgentOut]
+    version: Optional[PublishResponse] = None
+
+
+@router.post("/networks/{network_id}/apply", response_model=NetworkApplyResponse)
+def apply_network_spec(
+    network_id: int, payload: NetworkApplyRequest, db: Session = Depends(get_db_dep)
+):
+    """Attach tools, create and wire agents, and optionally publish in one call.
+
+    Steps run in order through the same helpers as the per-resource endpoints, so
+    validation and error responses match theirs: network tools, agents (in the
+    listed order, which must keep a RESPOND-capable agent available), agent tools
+    and routes, then publish. Nothing is committed until every step succeeds.
+    """
+    if not db.get(Network, network_id):
+        raise HTTPException(status_code=404, detail="network not found")
+
+    tools = _add_tools_to_network(db, network_id, SetTools(tool_keys=payload.tool_keys))
+
+    created = []
+    for spec in payload.agents:
+        agent_payload = AgentCreate(**spec.model_dump(exclude={"tool_keys", "route_keys"}))
+        created.append((spec, _create_agent(db, network_id, agent_payload)))
+
+    agents: List[AgentOut] = []
+    for spec, agent in created:
+        if spec.tool_keys:
+            agent = _set_agent_tools(
+                db, network_id, agent.id, SetTools(tool_keys=spec.tool_keys)
+            )
+        if spec.route_keys:
+            agent = _set_agent_routes(
+                db, network_id, agent.id, SetRoutes(agent_keys=spec.route_keys)
+            )
+        agents.append(agent)
+
+    version = None
+    if payload.publish is not None:
+        version = _compile_and_publish(db, network_id, payload.publish)
+    db.commit()
+    return NetworkApplyResponse(tools=tools, agents=agents, version=version)
@@ -44,6 +44,7 @@ def run_loop(
     model: Optional[str] = None,
     decide_fn: Optional[DecideFn] = None,
     debug: bool = False,
+    on_step_event: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> Dict[str, Any]:
     logger = logging.getLogger("arion_agents.engine.loop")
     decide = decide_fn or gemini_decide
@@ -88,18 +89,22 @@ def run_loop(
         entry_type: str, payload: Dict[str, Any], timestamp_ms: int
     ) -> None:
         nonlocal next_seq
-        step_events.append(
-            {
-                "seq": next_seq,
-                "t": timestamp_ms,
-                "step": {
-                    "kind": "log_entry",
-                    "entryType": entry_type,
-                    "payload": payload,
-                },
-            }
-        )
+        envelope = {
+            "seq": next_seq,
+            "t": timestamp_ms,
+            "step": {
+                "kind": "log_entry",
+                "entryType": entry_type,
+                "payload": payload,
+            },
+        }
+        step_events.append(envelope)
         next_seq += 1
+        if on_step_event is not None:
+            try:
+                on_step_event(envelope)
+            except Exception:
+                logger.exception("on_step_event callback failed")
 
     def _log_tool_execution(
         *,
@@ -1,9 +1,10 @@
+import json
 import os
 from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel
+from sqlmodel import Session, SQLModel, select
 
 TEST_DB_PATH = Path(__file__).parent / "config_test.sqlite"
 if TEST_DB_PATH.exists():
@@ -250,3 +251,177 @@ def test_patch_agent_updates_prompt_template(client: TestClient) -> None:
         agent = session.get(Agent, agent_id)
         assert agent is not None
         assert (agent.additional_data or {}).get("prompt_template") == new_prompt
+
+
+def test_apply_network_spec_creates_wires_and_publishes(client: TestClient) -> None:
+    with Session(engine) as session:
+        network_id = _create_network(session)
+
+    response = client.post(
+        f"/config/networks/{network_id}/apply",
+        json={
+            "agents": [
+                {"key": "writer", "allow_respond": True},
+                {
+                    "key": "triage",
+                    "allow_respond": False,
+                    "is_default": True,
+                    "route_keys": ["writer"],
+                },
+            ],
+            "publish": {"notes": "seeded"},
+        },
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["tools"] == []
+    assert [agent["key"] for agent in payload["agents"]] == ["writer", "triage"]
+    assert payload["agents"][1]["allowed_routes"] == ["writer"]
+    assert payload["version"]["version"] == 1
+
+    with Session(engine) as session:
+        network = session.get(Network, network_id)
+        assert network is not None
+        assert network.current_version_id == payload["version"]["id"]
+
+
+def test_apply_network_spec_reports_unknown_route(client: TestClient) -> None:
+    with Session(engine) as session:
+        network_id = _create_network(session)
+
+    response = client.post(
+        f"/config/networks/{network_id}/apply",
+        json={"agents": [{"key": "writer", "route_keys": ["missing"]}]},
+    )
+    assert response.status_code == 400
+    assert "missing" in response.json()["detail"]
+
+    # The failed route step must not leave the agent created before it behind.
+    assert client.get(f"/config/networks/{network_id}/agents").json() == []
+    with Session(engine) as session:
+        assert session.exec(select(Agent)).all() == []
+
+
+def test_add_tools_to_network_returns_network_tool_ids(client: TestClient) -> None:
+    with Session(engine) as session:
+        network_id = _create_network(session)
+
+    created = client.post(
+        "/config/tools",
+        json={
+            "key": "sun",
+            "provider_type": "http:request",
+            "additional_data": {"agent_params_json_schema": {"type": "object"}},
+        },
+    )
+    assert created.status_code == 201
+
+    first = client.post(
+        f"/config/networks/{network_id}/tools", json={"tool_keys": ["sun"]}
+    )
+    assert first.status_code == 200
+    [ref] = first.json()
+    assert ref["key"] == "sun"
+    assert ref["created"] is True
+
+    again = client.post(
+        f"/config/networks/{network_id}/tools", json={"tool_keys": ["sun"]}
+    )
+    assert again.status_code == 200
+    assert again.json() == [{"id": ref["id"], "key": "sun", "created": False}]
+
+    graph = client.get(f"/config/networks/{network_id}/graph").json()
+    assert [tool["id"] for tool in graph["tools"]] == [ref["id"]]
+
+
+def test_health_wait_reports_database_readiness(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import arion_agents.api as api_module
+
+    assert client.get("/health", params={"wait": 0.3}).json() == {"status": "ok"}
+
+    def _db_down() -> None:
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(api_module, "_db_ping", _db_down)
+    assert client.get("/health").json() == {"status": "ok"}
+    assert client.head("/health").status_code == 200
+    assert client.get("/health", params={"wait": 0.3}).status_code == 503
+
+    monkeypatch.setattr(api_module, "_db_ping", lambda: None)
+    response = client.get("/health", params={"wait": 0.3})
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_run_stream_emits_step_lines_then_final(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import arion_agents.engine.loop as loop_module
+
+    def _fake_run_loop(get_cfg, agent_key, user_message, **kwargs):
+        events = []
+        for seq, action in enumerate(["USE_TOOL", "RESPOND"]):
+            env = {"seq": seq, "agent_key": agent_key, "action": action}
+            events.append(env)
+            kwargs["on_step_event"](env)
+        return {"final": {"status": "ok", "response": user_message}, "step_events": events}
+
+    monkeypatch.setattr(loop_module, "run_loop", _fake_run_loop)
+    response = client.post(
+        "/run",
+        json={
+            "snapshot": {"default_agent_key": "writer"},
+            "user_message": "hello",
+            "stream": True,
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["type"] for line in lines] == ["step", "step", "final"]
+    assert [line["event"]["action"] for line in lines[:2]] == ["USE_TOOL", "RESPOND"]
+    assert lines[-1]["result"]["final"] == {"status": "ok", "response": "hello"}
+
+
+def test_run_stream_reports_http_errors_as_error_line(client: TestClient) -> None:
+    response = client.post(
+        "/run",
+        json={"network": "missing-network", "user_message": "hello", "stream": True},
+    )
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [
+        {
+            "type": "error",
+            "status_code": 404,
+            "detail": "Network 'missing-network' not found",
+        }
+    ]
+
+
+def test_run_stream_ends_with_error_line_on_unexpected_failure(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import arion_agents.engine.loop as loop_module
+
+    def _fake_run_loop(get_cfg, agent_key, user_message, **kwargs):
+        kwargs["on_step_event"]({"seq": 0, "action": "RESPOND"})
+        result = {"final": {"status": "ok"}}
+        result["final"]["self"] = result  # cannot be encoded as JSON
+        return result
+
+    monkeypatch.setattr(loop_module, "run_loop", _fake_run_loop)
+    response = client.post(
+        "/run",
+        json={
+            "snapshot": {"default_agent_key": "writer"},
+            "user_message": "hello",
+            "stream": True,
+        },
+    )
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["type"] for line in lines] == ["step", "error"]
+    assert lines[-1]["status_code"] == 500
@@ -226,3 +226,42 @@ def test_task_group_failure_aborts_run() -> None:
             assert entry["tool_key"] == "fail"
     finally:
         PROVIDERS.pop("test:fail", None)
+
+
+def test_on_step_event_receives_each_event_as_appended() -> None:
+    primary_cfg = RunConfig(
+        current_agent="primary",
+        equipped_tools=[],
+        tools_map={},
+        allowed_routes=[],
+        allow_respond=True,
+        allow_task_group=False,
+        allow_task_respond=False,
+        system_params={},
+        prompt=None,
+    )
+    decide_fn = _make_decide_fn(
+        [
+            AgentDecision(
+                action="RESPOND",
+                action_reasoning="complete",
+                action_details=RespondDetails(payload={"message": "done"}),
+            )
+        ]
+    )
+    seen: List[Dict[str, Any]] = []
+
+    result = run_loop(
+        lambda _: primary_cfg,
+        default_agent_key="primary",
+        user_message="Say done",
+        max_steps=2,
+        decide_fn=decide_fn,
+        model=None,
+        debug=False,
+        on_step_event=seen.append,
+    )
+
+    assert result["final"]["status"] == "ok"
+    assert seen == result["step_events"]
+    assert [env["seq"] for env in seen] == list(range(len(seen)))
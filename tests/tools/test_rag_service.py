@@ -0,0 +1,35 @@
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+pytest.importorskip("qdrant_client")
+pytest.importorskip("sentence_transformers")
+
+SERVICE_PATH = Path(__file__).resolve().parents[2] / "tools" / "rag_service" / "service.py"
+
+
+@pytest.fixture
+def service(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ModuleType:
+    monkeypatch.setenv("RAG_QDRANT_PATH", str(tmp_path / "qdrant"))
+    spec = importlib.util.spec_from_file_location("rag_service_under_test", SERVICE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_transform_filter_reuses_cached_filter(service: ModuleType) -> None:
+    first = service._transform_filter({"city": "Paris", "lang": "en"})
+    again = service._transform_filter({"lang": "en", "city": "Paris"})
+
+    assert again is first
+    assert [cond.key for cond in first.must] == ["city", "lang"]
+    assert list(service._FILTER_CACHE) == ['{"city":"Paris","lang":"en"}']
+
+
+def test_transform_filter_rejects_nested_values(service: ModuleType) -> None:
+    with pytest.raises(service.HTTPException) as excinfo:
+        service._transform_filter({"city": {"name": "Paris"}})
+    assert excinfo.value.status_code == 400
+    assert service._FILTER_CACHE == {}
@@ -0,0 +1,154 @@
+import importlib.util
+import json
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).resolve().parents[2] / "tools" / "show_last_run.py"
+
+RUN_FIELDS = {
+    "final": {"status": "ok", "response": "Sunset is at 21:58 — enjoy"},
+    "execution_log": [{"step": 0, "agent_key": "triage", "action": "USE_TOOL"}],
+    "debug": [
+        {"agent": "triage", "prompt": "Where is the sun?", "raw": '{"action": "USE_TOOL"}'},
+        {"agent": "writer", "prompt": "Summarise", "raw": "Sunset at 21:58"},
+    ],
+    "tool_log": {"exec-1": {"tool": "sun", "elapsed": 0.125, "ok": True}},
+    "latency": {
+        "steps": [
+            {
+                "step": 0,
+                "agent_key": "triage",
+                "action_type": "USE_TOOL",
+                "duration_ms": 12.75,
+                "llm_duration_ms": 10,
+                "tool_key": "sun",
+                "tool_duration_ms": 2.5,
+                "tool_status": "ok",
+            }
+        ],
+        "total_run_ms": 1500,
+    },
+    "llm_usage_totals": {"prompt_tokens": 120, "response_tokens": 30, "total_tokens": 150},
+    "run_duration_ms": 1500,
+}
+
+ARTIFACTS = {
+    "current": {"request": {"user_message": "hi"}, "response": {**RUN_FIELDS, "extra": [1, 2]}},
+    "legacy": {
+        "final": {"status": "legacy"},
+        "execution_log": [],
+        "debug": None,
+        "tool_log": [{"tool": "sun"}, {"tool": "geonames"}],
+    },
+}
+
+
+# Output of the script before artifacts were streamed, for edge cases: empty
+# streamed containers must keep the top-level fallback, and the non-strict JSON
+# that json.dump writes (NaN/Infinity, ints wider than 64 bits) must still render.
+PRE_STREAMING_OUTPUT = {
+    "empty_tool_log": (
+        {"response": {"final": {"status": "ok"}, "tool_log": {}}},
+        '\n=== Final Response ===\n{\n  "status": "ok"\n}\n'
+        "\n=== Execution Log ===\nnull\n"
+        "\n=== LLM Prompts & Raw Responses ===\n"
+        "\n=== Tool Calls ===\nnull\n",
+    ),
+    "empty_debug_falls_back_to_legacy": (
+        {
+            "response": {"final": {"s": 1}, "debug": []},
+            "debug": [{"agent": "a", "prompt": "p", "raw": "r"}],
+        },
+        '\n=== Final Response ===\n{\n  "s": 1\n}\n'
+        "\n=== Execution Log ===\nnull\n"
+        "\n=== LLM Prompts & Raw Responses ===\n"
+        "\nAgent: a\nPrompt:\np\nRaw:\nr\n"
+        "\n=== Tool Calls ===\nnull\n",
+    ),
+    "empty_tool_log_falls_back_to_legacy": (
+        {"response": {"tool_log": {}}, "tool_log": [1]},
+        "\n=== Final Response ===\nnull\n"
+        "\n=== Execution Log ===\nnull\n"
+        "\n=== LLM Prompts & Raw Responses ===\n"
+        "\n=== Tool Calls ===\n[\n  1\n]\n",
+    ),
+    "non_finite_floats": (
+        {
+            "response": {
+                "final": {"status": "ok"},
+                "execution_log": [{"v": float("nan")}],
+                "tool_log": {"exec-1": {"elapsed": float("inf")}},
+            }
+        },
+        '\n=== Final Response ===\n{\n  "status": "ok"\n}\n'
+        '\n=== Execution Log ===\n[\n  {\n    "v": NaN\n  }\n]\n'
+        "\n=== LLM Prompts & Raw Responses ===\n"
+        '\n=== Tool Calls ===\n\nExecution ID: exec-1\n{\n  "elapsed": Infinity\n}\n',
+    ),
+    "int_wider_than_64_bits": (
+        {
+            "response": {
+                "final": {"tokens": 12345678901234567890123},
+                "tool_log": {"exec-1": {"id": 12345678901234567890123}},
+            }
+        },
+        '\n=== Final Response ===\n{\n  "tokens": 12345678901234567890123\n}\n'
+        "\n=== Execution Log ===\nnull\n"
+        "\n=== LLM Prompts & Raw Responses ===\n"
+        '\n=== Tool Calls ===\n\nExecution ID: exec-1\n{\n  "id": 12345678901234567890123\n}\n',
+    ),
+}
+
+
+def _load_script(runs_dir: Path) -> ModuleType:
+    spec = importlib.util.spec_from_file_location("show_last_run_under_test", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.RUNS_DIR = runs_dir
+    return module
+
+
+def _render(module: ModuleType, capsysbinary: pytest.CaptureFixture[bytes]) -> str:
+    module.main()
+    return capsysbinary.readouterr().out.decode()
+
+
+def _render_both(
+    artifact: dict, runs_dir: Path, capsysbinary: pytest.CaptureFixture[bytes]
+) -> tuple[str, str]:
+    """Render ``artifact`` through the ijson path, then the whole-file fallback."""
+    pytest.importorskip("ijson")
+    (runs_dir / "run_20250101_000000_1.json").write_text(json.dumps(artifact))
+    module = _load_script(runs_dir)
+    streamed = _render(module, capsysbinary)
+    module.ijson = None
+    return streamed, _render(module, capsysbinary)
+
+
+@pytest.mark.parametrize("name", sorted(ARTIFACTS))
+def test_streaming_and_full_load_render_the_same(
+    name: str, tmp_path: Path, capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    streamed, loaded = _render_both(ARTIFACTS[name], tmp_path, capsysbinary)
+
+    assert streamed == loaded
+    assert "=== Final Response ===" in streamed
+    if name == "current":
+        assert "Prompt:\nWhere is the sun?\nRaw:\n" in streamed
+        assert "Execution ID: exec-1" in streamed
+        assert '"elapsed": 0.125' in streamed
+        assert "Step 1 (triage → USE_TOOL): total=0.013s" in streamed
+    else:
+        assert '"status": "legacy"' in streamed
+
+
+@pytest.mark.parametrize("name", sorted(PRE_STREAMING_OUTPUT))
+def test_empty_containers_render_as_before_streaming(
+    name: str, tmp_path: Path, capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    artifact, expected = PRE_STREAMING_OUTPUT[name]
+    header = f"File: {tmp_path / 'run_20250101_000000_1.json'}\n"
+    for output in _render_both(artifact, tmp_path, capsysbinary):
+        assert output == header + expected
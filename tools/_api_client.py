@@ -0,0 +1,88 @@
+"""Shared HTTP helpers for the seed/setup scripts in this directory.
+
+Scripts run as ``python tools/<script>.py`` and import from here directly
+(``from _api_client import ...``). Every helper goes through one keep-alive
+session, so scripts chained in a single process also share the pool.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API = os.getenv("API_URL", "http://localhost:8000")
+DEFAULT_HEADERS = {"Content-Type": "application/json"}
+
+# Transient gateway errors are retried for idempotent verbs only; a replayed POST
+# could double-apply because the API has no idempotency keys. Refused connections
+# fail fast (connect=0) so callers' own readiness polling sets the pace.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        connect=0,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "PUT", "DELETE", "HEAD"]),
+        raise_on_status=False,
+    ),
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+# A 503 from the /health?wait= long-poll already means "waited, still not ready";
+# never replay it.
+SESSION.mount(f"{API}/health", HTTPAdapter(max_retries=0))
+SESSION.headers.update(DEFAULT_HEADERS)
+
+
+def post(path: str, json: Any = None) -> requests.Response:
+    return SESSION.post(f"{API}{path}", json=json)
+
+
+def put(path: str, json: Any = None) -> requests.Response:
+    return SESSION.put(f"{API}{path}", json=json)
+
+
+def get(path: str) -> requests.Response:
+    return SESSION.get(f"{API}{path}")
+
+
+def delete(path: str) -> requests.Response:
+    return SESSION.delete(f"{API}{path}")
+
+
+def ensure_ok(
+    r: requests.Response,
+    expected: Union[int, Iterable[int]] = 200,
+    parse: bool = True,
+) -> Any:
+    """Raise unless ``r`` has an expected status; decode the body only when ``parse``."""
+    if isinstance(expected, int):
+        expected = (expected,)
+    if r.status_code not in expected:
+        print(
+            f"Error {r.status_code} for {r.request.method} {r.request.url}: {r.text}",
+            file=sys.stderr,
+        )
+        r.raise_for_status()
+    if not parse:
+        return None
+    return r.json() if r.content else {}
+
+
+def run_concurrently(
+    *calls: Callable[[], Any], max_workers: Optional[int] = None
+) -> List[Any]:
+    """Run independent API calls in parallel and return their results in order."""
+    if not calls:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers or len(calls)) as pool:
+        futures = [pool.submit(call) for call in calls]
+        return [future.result() for future in futures]
@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import Iterable, List
 from urllib.parse import urljoin
 
+import orjson
 import requests
 
 
@@ -99,12 +100,15 @@ def main() -> None:
     headers = {"Content-Type": "application/json"}
 
     try:
-        resp = requests.post(url, json=payload, headers=headers, timeout=args.timeout)
+        resp = requests.post(
+            url, data=orjson.dumps(payload), headers=headers, timeout=args.timeout
+        )
         resp.raise_for_status()
-        result = resp.json()
+        result = orjson.loads(resp.content)
         print(f"Indexed {result.get('indexed', 0)} document(s) via {url}")
-    except requests.RequestException as e:
-        print(f"Index request failed ({e.response.status_code if e.response else 'N/A'}): {e}")
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
+        response = getattr(e, "response", None)
+        print(f"Index request failed ({response.status_code if response else 'N/A'}): {e}")
         sys.exit(4)
 
 
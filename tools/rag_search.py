@@ -9,6 +9,7 @@ import sys
 from pathlib import Path
 from urllib.parse import urljoin
 
+import orjson
 import requests
 
 
@@ -70,14 +71,16 @@ def main() -> None:
     if args.api_key:
         headers[args.api_key_header] = args.api_key
 
-    resp = requests.post(url, json=payload, headers=headers, timeout=args.timeout)
+    resp = requests.post(
+        url, data=orjson.dumps(payload), headers=headers, timeout=args.timeout
+    )
     if resp.status_code >= 400:
         print(f"Search request failed ({resp.status_code}): {resp.text}", file=sys.stderr)
         sys.exit(4)
 
     try:
-        data = resp.json()
-    except json.JSONDecodeError:
+        data = orjson.loads(resp.content)
+    except orjson.JSONDecodeError:
         print(resp.text)
         sys.exit(0)
 
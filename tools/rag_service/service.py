@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence
 
 import numpy as np
+import orjson
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
 from qdrant_client import QdrantClient
@@ -34,10 +35,22 @@ CONFIGURED_COLLECTIONS: Sequence[str] = tuple(
 
 if not CONFIGURED_COLLECTIONS:
     raise RuntimeError("RAG_COLLECTIONS resolved to an empty list; configure at least one collection")
+_CONFIGURED_SET = frozenset(CONFIGURED_COLLECTIONS)
 
 EMBED_MODEL_NAME = os.getenv("RAG_EMBED_MODEL", "BAAI/bge-large-en")
 EMBED_BATCH_SIZE = int(os.getenv("RAG_EMBED_BATCH", "16"))
 EMBED_NORMALIZE = os.getenv("RAG_EMBED_NORMALIZE", "true").lower() not in {"0", "false", "no"}
+# Opt-in: on CUDA, pad batches to fixed lengths and replay captured CUDA graphs.
+EMBED_CUDA_GRAPHS = os.getenv("RAG_EMBED_CUDA_GRAPHS", "false").lower() in {"1", "true", "yes"}
+_SEQ_LEN_BUCKETS = (64, 128, 256, 512)
+
+# Per-query HNSW beam width is max(HNSW_EF_MIN, top_k * HNSW_EF_MULT).
+HNSW_EF_MULT = int(os.getenv("RAG_HNSW_EF_MULT", "4"))
+HNSW_EF_MIN = 64
+
+# When set, talk to a Qdrant server over gRPC instead of the embedded store.
+QDRANT_URL = os.getenv("RAG_QDRANT_URL")
+QDRANT_GRPC_PORT = int(os.getenv("RAG_QDRANT_GRPC_PORT", "6334"))
 
 _storage_path = Path(os.getenv("RAG_QDRANT_PATH", "./data/qdrant")).resolve()
 _storage_path.mkdir(parents=True, exist_ok=True)
@@ -50,6 +63,11 @@ _client: Optional[QdrantClient] = None
 _embedder: Optional[SentenceTransformer] = None
 _vector_size: Optional[int] = None
 _ready_collections: set[str] = set()
+_static_meta: Optional[Dict[str, Any]] = None
+
+# Built filters keyed by their canonical JSON form; FIFO-evicted once full.
+_FILTER_CACHE: Dict[str, qmodels.Filter] = {}
+_FILTER_CACHE_MAX = 1024
 
 
 class DocumentIn(BaseModel):
@@ -130,9 +148,15 @@ app = FastAPI(title="RAG Dev Service", lifespan=lifespan)
 def get_client() -> QdrantClient:
     global _client
     if _client is None:
-        logger.info("Initialising embedded Qdrant client at %s", _storage_path)
         logger.info("--> Calling QdrantClient constructor...")
-        _client = QdrantClient(path=str(_storage_path), prefer_grpc=False)
+        if QDRANT_URL:
+            logger.info("Connecting to Qdrant server at %s (gRPC)", QDRANT_URL)
+            _client = QdrantClient(
+                url=QDRANT_URL, prefer_grpc=True, grpc_port=QDRANT_GRPC_PORT
+            )
+        else:
+            logger.info("Initialising embedded Qdrant client at %s", _storage_path)
+            _client = QdrantClient(path=str(_storage_path))
         logger.info("--> QdrantClient constructor returned.")
     return _client
 
@@ -146,9 +170,47 @@ def get_embedder() -> SentenceTransformer:
         logger.info("--> SentenceTransformer constructor returned.")
         _vector_size = int(_embedder.get_sentence_embedding_dimension())
         logger.info("Embedding dimension: %s", _vector_size)
+        if EMBED_CUDA_GRAPHS:
+            _enable_cuda_graphs(_embedder)
     return _embedder
 
 
+def _enable_cuda_graphs(embedder: SentenceTransformer) -> None:
+    """Capture the transformer forward pass as CUDA graphs per padded length.
+
+    Token batches are right-padded up to the nearest bucket in _SEQ_LEN_BUCKETS so
+    only a handful of shapes are ever seen; torch.compile's "reduce-overhead" mode
+    records one CUDA graph per shape and replays it, removing per-kernel launch
+    overhead. Longer inputs keep their natural length.
+    """
+    import torch
+    import torch.nn.functional as F
+
+    if not torch.cuda.is_available():
+        logger.info("RAG_EMBED_CUDA_GRAPHS set but CUDA is unavailable; using eager mode")
+        return
+
+    transformer = embedder[0]
+    pad_id = transformer.tokenizer.pad_token_id or 0
+    tokenize = transformer.tokenize
+
+    def _bucketed_tokenize(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+        features = tokenize(*args, **kwargs)
+        length = features["input_ids"].shape[1]
+        bucket = next((size for size in _SEQ_LEN_BUCKETS if size >= length), length)
+        if bucket == length:
+            return features
+        for name, tensor in features.items():
+            if isinstance(tensor, torch.Tensor) and tensor.dim() == 2:
+                fill = pad_id if name == "input_ids" else 0
+                features[name] = F.pad(tensor, (0, bucket - length), value=fill)
+        return features
+
+    transformer.tokenize = _bucketed_tokenize
+    transformer.auto_model = torch.compile(transformer.auto_model, mode="reduce-overhead")
+    logger.info("CUDA graph capture enabled for buckets %s", _SEQ_LEN_BUCKETS)
+
+
 def _vector_dim() -> int:
     if _vector_size is None:
         get_embedder()
@@ -156,6 +218,18 @@ def _vector_dim() -> int:
     return _vector_size
 
 
+def _static_search_meta() -> Dict[str, Any]:
+    """Response metadata that is fixed once the embedder has loaded."""
+    global _static_meta
+    if _static_meta is None:
+        _static_meta = {
+            "available_collections": list(CONFIGURED_COLLECTIONS),
+            "vector_dim": _vector_dim(),
+            "model": EMBED_MODEL_NAME,
+        }
+    return _static_meta
+
+
 def ensure_collection(name: str) -> None:
     if name in _ready_collections:
         return
@@ -170,6 +244,8 @@ def ensure_collection(name: str) -> None:
         client.create_collection(
             collection_name=name,
             vectors_config=qmodels.VectorParams(size=dim, distance=qmodels.Distance.COSINE),
+            hnsw_config=qmodels.HnswConfigDiff(m=16, ef_construct=128, on_disk=True),
+            optimizers_config=qmodels.OptimizersConfigDiff(memmap_threshold=20000),
         )
         _ready_collections.add(name)
         return
@@ -207,6 +283,14 @@ def _encode_texts(texts: Sequence[str]) -> np.ndarray:
 def _transform_filter(raw_filter: Optional[Dict[str, Any]]) -> Optional[qmodels.Filter]:
     if not raw_filter:
         return None
+    try:
+        cache_key = orjson.dumps(raw_filter, option=orjson.OPT_SORT_KEYS).decode()
+    except TypeError:
+        cache_key = None
+    if cache_key is not None:
+        cached = _FILTER_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
     conditions: List[qmodels.FieldCondition] = []
     for key, value in raw_filter.items():
         if isinstance(value, (str, int, float, bool)) or value is None:
@@ -220,11 +304,16 @@ def _transform_filter(raw_filter: Optional[Dict[str, Any]]) -> Optional[qmodels.
             )
     if not conditions:
         return None
-    return qmodels.Filter(must=conditions)
+    built = qmodels.Filter(must=conditions)
+    if cache_key is not None:
+        if len(_FILTER_CACHE) >= _FILTER_CACHE_MAX:
+            _FILTER_CACHE.pop(next(iter(_FILTER_CACHE)))
+        _FILTER_CACHE[cache_key] = built
+    return built
 
 
 def _validate_collection(name: str) -> str:
-    if name not in CONFIGURED_COLLECTIONS:
+    if name not in _CONFIGURED_SET:
         configured = ", ".join(CONFIGURED_COLLECTIONS)
         raise HTTPException(
             status_code=400,
@@ -269,22 +358,14 @@ async def index_docs(payload: IndexRequest) -> Dict[str, Any]:
 
     for collection, docs in grouped.items():
         vectors = _encode_texts([doc.text for doc in docs])
-        points = []
-        for doc, vector in zip(docs, vectors):
-            payload_dict = {
-                "text": doc.text,
-                "metadata": doc.metadata,
-            }
-            points.append(
-                qmodels.PointStruct(
-                    id=doc.id,
-                    vector=vector.astype(float).tolist(),
-                    payload=payload_dict,
-                )
-            )
-        client.upsert(collection_name=collection, points=points)
-        total += len(points)
-        logger.info("Indexed %s documents into %s", len(points), collection)
+        batch = qmodels.Batch(
+            ids=[doc.id for doc in docs],
+            vectors=vectors.tolist(),
+            payloads=[{"text": doc.text, "metadata": doc.metadata} for doc in docs],
+        )
+        client.upsert(collection_name=collection, points=batch)
+        total += len(docs)
+        logger.info("Indexed %s documents into %s", len(docs), collection)
 
     return {"indexed": total, "collections": list(grouped.keys())}
 
@@ -331,9 +412,10 @@ async def chunk_and_index(payload: ChunkAndIndexRequest) -> Dict[str, Any]:
     vectors = _encode_texts(texts)
 
     client = get_client()
-    points: List[qmodels.PointStruct] = []
+    ids: List[str] = []
+    payloads: List[Dict[str, Any]] = []
 
-    for chunk, vector in zip(chunked.chunks, vectors):
+    for chunk in chunked.chunks:
         chunk_meta = dict(chunk.metadata)
         if metadata_str:
             chunk_meta.setdefault("document_metadata", metadata_str)
@@ -343,21 +425,16 @@ async def chunk_and_index(payload: ChunkAndIndexRequest) -> Dict[str, Any]:
         if section_summary:
             chunk_meta.setdefault("section_summary", section_summary)
 
-        points.append(
-            qmodels.PointStruct(
-                id=chunk.id,
-                vector=vector.astype(float).tolist(),
-                payload={
-                    "text": chunk.text,
-                    "metadata": chunk_meta,
-                },
-            )
-        )
+        ids.append(chunk.id)
+        payloads.append({"text": chunk.text, "metadata": chunk_meta})
 
-    client.upsert(collection_name=collection, points=points)
+    client.upsert(
+        collection_name=collection,
+        points=qmodels.Batch(ids=ids, vectors=vectors.tolist(), payloads=payloads),
+    )
     logger.info(
         "Chunked and indexed %s chunks for document %s into %s",
-        len(points),
+        len(ids),
         payload.document_id,
         collection,
     )
@@ -365,7 +442,7 @@ async def chunk_and_index(payload: ChunkAndIndexRequest) -> Dict[str, Any]:
     response: Dict[str, Any] = {
         "document_id": payload.document_id,
         "collection": collection,
-        "chunks_indexed": len(points),
+        "chunks_indexed": len(ids),
         "stats": chunked.stats,
     }
     if chunked.document_summary:
@@ -388,17 +465,21 @@ async def search_docs(payload: SearchRequest) -> SearchResponse:
     client = get_client()
     results = client.search(
         collection_name=collection,
-        query_vector=vector.astype(float).tolist(),
+        query_vector=vector.tolist(),
         limit=top_k,
         with_payload=True,
         query_filter=filter_,
+        search_params=qmodels.SearchParams(
+            hnsw_ef=max(HNSW_EF_MIN, top_k * HNSW_EF_MULT), exact=False
+        ),
     )
 
+    # Qdrant already returns typed values, so skip per-match validation.
     matches: List[MatchOut] = []
     for point in results:
         payload_dict = point.payload or {}
         matches.append(
-            MatchOut(
+            MatchOut.model_construct(
                 id=str(point.id),
                 score=float(point.score or 0.0),
                 text=payload_dict.get("text", ""),
@@ -409,12 +490,8 @@ async def search_docs(payload: SearchRequest) -> SearchResponse:
     context_parts = [match.text for match in matches if match.text]
     context = "\n\n".join(context_parts) if context_parts else None
 
-    meta = {
-        "collection": collection,
-        "returned": len(matches),
-        "available_collections": list(CONFIGURED_COLLECTIONS),
-        "vector_dim": _vector_dim(),
-        "model": EMBED_MODEL_NAME,
-    }
+    meta = {"collection": collection, "returned": len(matches), **_static_search_meta()}
 
-    return SearchResponse(query=payload.query, matches=matches, context=context, meta=meta)
+    return SearchResponse.model_construct(
+        query=payload.query, matches=matches, context=context, meta=meta
+    )
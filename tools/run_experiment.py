@@ -79,9 +79,22 @@ def main() -> int:
     experiment_id = args.experiment_id or uuid.uuid4().hex
     api_root = args.api_root.rstrip("/")
 
+    # Upload and launch hit the same host back to back; share one pooled connection.
+    with requests.Session() as session:
+        return _upload_and_launch(session, args, file_path, api_root, experiment_id, shared_params)
+
+
+def _upload_and_launch(
+    session: requests.Session,
+    args: argparse.Namespace,
+    file_path: Path,
+    api_root: str,
+    experiment_id: str,
+    shared_params: Dict[str, Any],
+) -> int:
     try:
         with file_path.open("rb") as fh:
-            resp = requests.post(
+            resp = session.post(
                 f"{api_root}/run-batch/upload",
                 files={"file": (file_path.name, fh)},
                 timeout=60,
@@ -142,7 +155,7 @@ def main() -> int:
         payload["max_steps"] = args.max_steps
 
     try:
-        response = requests.post(
+        response = session.post(
             f"{api_root}/run-batch",
             json=payload,
             timeout=60,
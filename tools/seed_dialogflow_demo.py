@@ -6,16 +6,20 @@ from __future__ import annotations
 import os
 import sys
 import time
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
+import orjson
 import requests
 
+from _api_client import API as API_ROOT, SESSION, run_concurrently
+
 
-API_ROOT = os.getenv("API_URL", "http://localhost:8000")
 NETWORK_NAME = os.getenv("DIALOGFLOW_DEMO_NETWORK", "dialogflow_multiple_accounts_demo")
 TOOL_KEY = os.getenv("DIALOGFLOW_DEMO_TOOL", "dialogflow_cx_tester")
 AGENT_KEY = os.getenv("DIALOGFLOW_DEMO_AGENT", "dialogflow_multi_account_tester")
-EVAL_AGENT_KEY = os.getenv("DIALOGFLOW_EVAL_AGENT", "dialogflow_evaluator")
+# Set DIALOGFLOW_EVAL_AGENT to an empty string to seed the tester agent on its own.
+EVAL_AGENT_KEY = os.getenv("DIALOGFLOW_EVAL_AGENT", "dialogflow_evaluator") or None
 SECRET_REF = os.getenv("DIALOGFLOW_DEMO_SECRET_REF", "dialogflow_service_account.json")
 DEFAULT_AGENT_ID = os.getenv(
     "DIALOGFLOW_AGENT_ID", "fde810bf-b9fb-4924-85be-2aab8b4896e1"
@@ -68,8 +72,177 @@ infrastructure reasons, and UNKNOWN when you cannot reach a conclusion.
 """.strip()
 
 
-def _url(path: str) -> str:
-    return f"{API_ROOT}{path}"
+# Evaluator is listed first so the network always has a RESPOND-capable agent.
+# Without an evaluator the tester responds itself.
+EVAL_AGENT_PAYLOAD = {
+    "key": EVAL_AGENT_KEY,
+    "display_name": "DialogFlow Evaluation Agent",
+    "allow_respond": True,
+    "is_default": False,
+    "prompt_template": EVAL_PROMPT,
+}
+PRIMARY_AGENT_PAYLOAD = {
+    "key": AGENT_KEY,
+    "display_name": "DialogFlow Account Policy Tester",
+    "allow_respond": EVAL_AGENT_KEY is None,
+    "is_default": True,
+    "prompt_template": AGENT_PROMPT,
+}
+PUBLISH_PAYLOAD = {
+    "notes": "Initial DialogFlow CX demo network",
+    "created_by": "seed_dialogflow_demo",
+    "published_by": "seed_dialogflow_demo",
+}
+EVAL_ROUTES = [EVAL_AGENT_KEY] if EVAL_AGENT_KEY else []
+APPLY_PAYLOAD = {
+    "agents": ([EVAL_AGENT_PAYLOAD] if EVAL_AGENT_KEY else [])
+    + [
+        {
+            **PRIMARY_AGENT_PAYLOAD,
+            "tool_keys": [TOOL_KEY],
+            "route_keys": EVAL_ROUTES,
+        },
+    ],
+    "publish": PUBLISH_PAYLOAD,
+}
+
+TOOL_PAYLOAD = {
+    "key": TOOL_KEY,
+    "display_name": "DialogFlow CX Tester",
+    "description": "Sends utterances to the DialogFlow CX bot under test.",
+    "provider_type": "dialogflow:cx",
+    "params_schema": {
+        "query": {"source": "agent", "required": True},
+        "username": {"source": "system", "required": False},
+        "customer_verified": {"source": "system", "required": False},
+        "session_parameters": {"source": "system", "required": False},
+        "dialogflow_project_id": {"source": "system", "required": True},
+        "dialogflow_location": {"source": "system", "required": True},
+        "dialogflow_environment": {"source": "system", "required": False},
+        "dialogflow_language_code": {"source": "system", "required": True},
+        "dialogflow_agent_id": {"source": "system", "required": True},
+        "dialogflow_session_id": {"source": "system", "required": False},
+    },
+    "secret_ref": SECRET_REF,
+    "additional_data": {
+        "description": "Invoke DialogFlow CX detectIntent using the configured service account.",
+        "agent_params_json_schema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "minLength": 1,
+                    "description": "User-style utterance to send to the bot.",
+                }
+            },
+            "required": ["query"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+NETWORK_PAYLOAD = {
+    "name": NETWORK_NAME,
+    "description": "DialogFlow CX policy regression harness",
+    "additional_data": {
+        "respond_payload_guidance": "The responding agent must emit response_payload.answer (string) and response_payload.evaluation.verdict (pass|fail|partial|error|unknown).",
+        "respond_payload_schema": {
+            "type": "object",
+            "properties": {
+                "response_payload": {
+                    "type": "object",
+                    "properties": {
+                        "answer": {"type": "string"},
+                        "evaluation": {
+                            "type": "object",
+                            "properties": {
+                                "verdict": {
+                                    "type": "string",
+                                    "enum": [
+                                        "pass",
+                                        "fail",
+                                        "partial",
+                                        "error",
+                                        "unknown"
+                                    ]
+                                },
+                                "notes": {"type": "string"}
+                            },
+                            "required": ["verdict"],
+                            "additionalProperties": False
+                        }
+                    },
+                    "required": ["answer", "evaluation"],
+                    "additionalProperties": False
+                }
+            },
+            "required": ["response_payload"],
+            "additionalProperties": False
+        },
+        "respond_payload_example": {
+            "response_payload": {
+                "answer": "The bot explicitly states customers may only maintain a single account.",
+                "evaluation": {
+                    "verdict": "pass",
+                    "notes": "Bot refused the multi-account request and cited the policy."
+                }
+            }
+        }
+    },
+}
+
+SMOKE_PAYLOAD = {
+    "network": NETWORK_NAME,
+    "user_message": (
+        "You are a customer of Dafabet interacting with the Dafabet chatbot. "
+        "Attempt to determine if you are allowed to have more than one account "
+        "by conversing with the chatbot."
+    ),
+    "system_params": {
+        "dialogflow_agent_id": DEFAULT_AGENT_ID,
+        "username": "CSTESTINR",
+        "customer_verified": "true",
+    },
+    "debug": False,
+    "stream": True,
+}
+
+TOOL_PATCH_PAYLOAD = {k: v for k, v in TOOL_PAYLOAD.items() if k != "key"}
+
+# Static request bodies are encoded once at import and sent as raw bytes.
+TOOL_PAYLOAD_BYTES = orjson.dumps(TOOL_PAYLOAD)
+TOOL_PATCH_PAYLOAD_BYTES = orjson.dumps(TOOL_PATCH_PAYLOAD)
+NETWORK_PAYLOAD_BYTES = orjson.dumps(NETWORK_PAYLOAD)
+APPLY_PAYLOAD_BYTES = orjson.dumps(APPLY_PAYLOAD)
+SMOKE_PAYLOAD_BYTES = orjson.dumps(SMOKE_PAYLOAD)
+EVAL_AGENT_PAYLOAD_BYTES = orjson.dumps(EVAL_AGENT_PAYLOAD)
+PRIMARY_AGENT_PAYLOAD_BYTES = orjson.dumps(PRIMARY_AGENT_PAYLOAD)
+PUBLISH_PAYLOAD_BYTES = orjson.dumps(PUBLISH_PAYLOAD)
+TOOL_KEYS_BYTES = orjson.dumps({"tool_keys": [TOOL_KEY]})
+
+
+HEALTH_URL = f"{API_ROOT}/health"
+RUN_URL = f"{API_ROOT}/run"
+TOOLS_URL = f"{API_ROOT}/config/tools"
+NETWORKS_URL = f"{API_ROOT}/config/networks"
+
+
+@lru_cache(maxsize=None)
+def network_endpoints(network_id: int) -> Dict[str, str]:
+    """Endpoint URLs for one network, built once per id."""
+    base = f"{NETWORKS_URL}/{network_id}"
+    return {
+        "self": base,
+        "tools": f"{base}/tools",
+        "agents": f"{base}/agents",
+        "graph": f"{base}/graph",
+        "apply": f"{base}/apply",
+        "publish": f"{base}/versions/compile_and_publish",
+    }
+
+
+def _send_json(method: str, url: str, body: bytes, **kwargs: Any) -> requests.Response:
+    return SESSION.request(method, url, data=body, **kwargs)
 
 
 def _ensure_ok(resp: requests.Response, *expected: int) -> Any:
@@ -79,243 +252,166 @@ def _ensure_ok(resp: requests.Response, *expected: int) -> Any:
         msg = f"HTTP {resp.status_code} for {resp.request.method} {resp.request.url}: {resp.text}"
         raise RuntimeError(msg)
     if resp.content:
-        return resp.json()
+        return orjson.loads(resp.content)
     return None
 
 
 def wait_for_api(timeout: float = 30.0) -> None:
-    deadline = time.time() + timeout
-    while time.time() < deadline:
+    # Once the server accepts connections a single /health?wait= long-poll blocks
+    # until it is ready; until then, back off from 50 ms up to 1 s between connects.
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        remaining = deadline - time.monotonic()
         try:
-            resp = requests.get(_url("/health"), timeout=5)
+            resp = SESSION.get(
+                HEALTH_URL,
+                params={"wait": round(max(0.0, min(remaining, 60.0)), 1)},
+                timeout=(5, remaining + 2),
+            )
             if resp.status_code == 200:
                 return
         except requests.RequestException:
             pass
-        time.sleep(1.5)
-    raise RuntimeError("API did not become available in time")
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise RuntimeError("API did not become available in time")
+        time.sleep(min(1.0, 0.05 * 2**attempt, remaining))
+        attempt += 1
 
 
 def upsert_tool() -> int:
-    payload = {
-        "key": TOOL_KEY,
-        "display_name": "DialogFlow CX Tester",
-        "description": "Sends utterances to the DialogFlow CX bot under test.",
-        "provider_type": "dialogflow:cx",
-        "params_schema": {
-            "query": {"source": "agent", "required": True},
-            "username": {"source": "system", "required": False},
-            "customer_verified": {"source": "system", "required": False},
-            "session_parameters": {"source": "system", "required": False},
-            "dialogflow_project_id": {"source": "system", "required": True},
-            "dialogflow_location": {"source": "system", "required": True},
-            "dialogflow_environment": {"source": "system", "required": False},
-            "dialogflow_language_code": {"source": "system", "required": True},
-            "dialogflow_agent_id": {"source": "system", "required": True},
-            "dialogflow_session_id": {"source": "system", "required": False},
-        },
-        "secret_ref": SECRET_REF,
-        "additional_data": {
-            "description": "Invoke DialogFlow CX detectIntent using the configured service account.",
-            "agent_params_json_schema": {
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "minLength": 1,
-                        "description": "User-style utterance to send to the bot.",
-                    }
-                },
-                "required": ["query"],
-                "additionalProperties": False,
-            },
-        },
-    }
-
-    existing_tools = _ensure_ok(requests.get(_url("/config/tools")))
+    existing_tools = _ensure_ok(SESSION.get(TOOLS_URL))
     for tool in existing_tools or []:
         if tool.get("key") == TOOL_KEY:
             tool_id = tool["id"]
-            patch_payload = {
-                "display_name": payload["display_name"],
-                "description": payload["description"],
-                "provider_type": payload["provider_type"],
-                "params_schema": payload["params_schema"],
-                "secret_ref": payload["secret_ref"],
-                "additional_data": payload["additional_data"],
-            }
             _ensure_ok(
-                requests.patch(_url(f"/config/tools/{tool_id}"), json=patch_payload)
+                _send_json("PATCH", f"{TOOLS_URL}/{tool_id}", TOOL_PATCH_PAYLOAD_BYTES)
             )
             return tool_id
 
-    created = _ensure_ok(requests.post(_url("/config/tools"), json=payload), 201)
+    created = _ensure_ok(_send_json("POST", TOOLS_URL, TOOL_PAYLOAD_BYTES), 201)
     return created["id"]
 
 
 def recreate_network() -> int:
-    networks = _ensure_ok(requests.get(_url("/config/networks")))
+    networks = _ensure_ok(SESSION.get(NETWORKS_URL))
     for net in networks or []:
         if net.get("name") == NETWORK_NAME:
-            _ensure_ok(requests.delete(_url(f"/config/networks/{net['id']}")), 204)
+            _ensure_ok(SESSION.delete(network_endpoints(net["id"])["self"]), 204)
             break
 
-    payload = {
-        "name": NETWORK_NAME,
-        "description": "DialogFlow CX policy regression harness",
-        "additional_data": {
-            "respond_payload_guidance": "The evaluation agent must emit response_payload.answer (string) and response_payload.evaluation.verdict (pass|fail|partial|error|unknown).",
-            "respond_payload_schema": {
-                "type": "object",
-                "properties": {
-                    "response_payload": {
-                        "type": "object",
-                        "properties": {
-                            "answer": {"type": "string"},
-                            "evaluation": {
-                                "type": "object",
-                                "properties": {
-                                    "verdict": {
-                                        "type": "string",
-                                        "enum": [
-                                            "pass",
-                                            "fail",
-                                            "partial",
-                                            "error",
-                                            "unknown"
-                                        ]
-                                    },
-                                    "notes": {"type": "string"}
-                                },
-                                "required": ["verdict"],
-                                "additionalProperties": False
-                            }
-                        },
-                        "required": ["answer", "evaluation"],
-                        "additionalProperties": False
-                    }
-                },
-                "required": ["response_payload"],
-                "additionalProperties": False
-            },
-            "respond_payload_example": {
-                "response_payload": {
-                    "answer": "The bot explicitly states customers may only maintain a single account.",
-                    "evaluation": {
-                        "verdict": "pass",
-                        "notes": "Bot refused the multi-account request and cited the policy."
-                    }
-                }
-            }
-        },
-    }
-    created = _ensure_ok(requests.post(_url("/config/networks"), json=payload), 201)
+    created = _ensure_ok(_send_json("POST", NETWORKS_URL, NETWORK_PAYLOAD_BYTES), 201)
     return created["id"]
 
 
 def add_tool_to_network(network_id: int) -> int:
-    result = _ensure_ok(
-        requests.post(
-            _url(f"/config/networks/{network_id}/tools"),
-            json={"tool_keys": [TOOL_KEY]},
-        )
-    )
+    endpoints = network_endpoints(network_id)
+    result = _ensure_ok(_send_json("POST", endpoints["tools"], TOOL_KEYS_BYTES))
     if not result:
         raise RuntimeError("Failed to attach tool to network")
+    if isinstance(result[0], dict):
+        return next(tool["id"] for tool in result if tool["key"] == TOOL_KEY)
 
-    # Find the network-local tool id for later reference.
-    graph = _ensure_ok(requests.get(_url(f"/config/networks/{network_id}/graph")))
+    # Older APIs only return the created keys; look the id up in the graph.
+    graph = _ensure_ok(SESSION.get(endpoints["graph"]))
     for tool in graph.get("tools", []):
         if tool.get("key") == TOOL_KEY:
             return tool["id"]
     raise RuntimeError("network tool not found after creation")
 
 
-def create_agents(network_id: int) -> tuple[int, int]:
-    # Create evaluation agent first so the network immediately satisfies the RESPOND constraint.
-    eval_payload = {
-        "key": EVAL_AGENT_KEY,
-        "display_name": "DialogFlow Evaluation Agent",
-        "allow_respond": True,
-        "is_default": False,
-        "prompt_template": EVAL_PROMPT,
-    }
-    evaluator = _ensure_ok(
-        requests.post(_url(f"/config/networks/{network_id}/agents"), json=eval_payload),
-        201,
-    )
+def apply_network_spec(network_id: int) -> Optional[tuple[int, Optional[int]]]:
+    """Create, equip, route and publish the agents in a single request.
 
-    primary_payload = {
-        "key": AGENT_KEY,
-        "display_name": "DialogFlow Account Policy Tester",
-        "allow_respond": False,
-        "is_default": True,
-        "prompt_template": AGENT_PROMPT,
-    }
-    primary = _ensure_ok(
-        requests.post(_url(f"/config/networks/{network_id}/agents"), json=primary_payload),
-        201,
-    )
+    Returns None when the API predates the /apply endpoint.
+    """
+    resp = _send_json("POST", network_endpoints(network_id)["apply"], APPLY_PAYLOAD_BYTES)
+    if resp.status_code in (404, 405):
+        return None
+    applied = _ensure_ok(resp)
+    agent_ids = {agent["key"]: agent["id"] for agent in applied["agents"]}
+    return agent_ids[AGENT_KEY], agent_ids.get(EVAL_AGENT_KEY)
 
-    return primary["id"], evaluator["id"]
+
+def create_agents(network_id: int) -> tuple[int, Optional[int]]:
+    agents_url = network_endpoints(network_id)["agents"]
+    evaluator_id = None
+    if EVAL_AGENT_KEY:
+        evaluator = _ensure_ok(_send_json("POST", agents_url, EVAL_AGENT_PAYLOAD_BYTES), 201)
+        evaluator_id = evaluator["id"]
+    primary = _ensure_ok(_send_json("POST", agents_url, PRIMARY_AGENT_PAYLOAD_BYTES), 201)
+    return primary["id"], evaluator_id
 
 
 def equip_agent(network_id: int, agent_id: int) -> None:
-    _ensure_ok(
-        requests.put(
-            _url(f"/config/networks/{network_id}/agents/{agent_id}/tools"),
-            json={"tool_keys": [TOOL_KEY]},
-        )
-    )
+    agent_url = f"{network_endpoints(network_id)['agents']}/{agent_id}"
+    _ensure_ok(_send_json("PUT", f"{agent_url}/tools", TOOL_KEYS_BYTES))
 
 
 def set_agent_routes(network_id: int, agent_id: int, routes: list[str]) -> None:
-    _ensure_ok(
-        requests.put(
-            _url(f"/config/networks/{network_id}/agents/{agent_id}/routes"),
-            json={"agent_keys": routes},
-        )
-    )
+    agent_url = f"{network_endpoints(network_id)['agents']}/{agent_id}"
+    _ensure_ok(_send_json("PUT", f"{agent_url}/routes", orjson.dumps({"agent_keys": routes})))
 
 
 def publish_network(network_id: int) -> None:
-    payload = {
-        "notes": "Initial DialogFlow CX demo network",
-        "created_by": "seed_dialogflow_demo",
-        "published_by": "seed_dialogflow_demo",
-    }
     _ensure_ok(
-        requests.post(
-            _url(f"/config/networks/{network_id}/versions/compile_and_publish"),
-            json=payload,
-        )
+        _send_json("POST", network_endpoints(network_id)["publish"], PUBLISH_PAYLOAD_BYTES)
     )
 
 
+def wire_agents_per_endpoint(network_id: int) -> tuple[int, Optional[int]]:
+    """Fallback for APIs without /apply: one request per agent, tool set and route."""
+    primary_agent_id, evaluator_agent_id = create_agents(network_id)
+    calls = [
+        lambda: equip_agent(network_id, primary_agent_id),
+        lambda: set_agent_routes(network_id, primary_agent_id, EVAL_ROUTES),
+    ]
+    if evaluator_agent_id is not None:
+        calls.append(lambda: set_agent_routes(network_id, evaluator_agent_id, []))
+    run_concurrently(*calls)
+    publish_network(network_id)
+    return primary_agent_id, evaluator_agent_id
+
+
+def _print_step_event(envelope: Dict[str, Any]) -> None:
+    step = envelope.get("step") or {}
+    payload = step.get("payload") or {}
+    label = payload.get("tool_key") or payload.get("agent_key") or ""
+    action = (payload.get("decision") or {}).get("action") or payload.get("status") or ""
+    print(f"  [{envelope.get('seq')}] {step.get('entryType')} {label} {action}".rstrip())
+
+
 def run_smoke_test() -> Optional[Dict[str, Any]]:
-    payload = {
-        "network": NETWORK_NAME,
-        "user_message": (
-            "You are a customer of Dafabet interacting with the Dafabet chatbot. "
-            "Attempt to determine if you are allowed to have more than one account "
-            "by conversing with the chatbot."
-        ),
-        "system_params": {
-            "dialogflow_agent_id": DEFAULT_AGENT_ID,
-            "username": "CSTESTINR",
-            "customer_verified": "true",
-        },
-        "debug": False,
-    }
+    """Run the smoke test, printing step events as the API streams them."""
     try:
-        resp = requests.post(_url("/run"), json=payload, timeout=120)
-        if resp.status_code != 200:
-            print(
-                f"Smoke test failed with status {resp.status_code}: {resp.text}",
-                file=sys.stderr,
-            )
-            return None
-        return resp.json()
+        with _send_json(
+            "POST", RUN_URL, SMOKE_PAYLOAD_BYTES, stream=True, timeout=(5, 120)
+        ) as resp:
+            if resp.status_code != 200:
+                print(
+                    f"Smoke test failed with status {resp.status_code}: {resp.text}",
+                    file=sys.stderr,
+                )
+                return None
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                message = orjson.loads(line)
+                kind = message.get("type")
+                if kind == "step":
+                    _print_step_event(message.get("event") or {})
+                elif kind == "final":
+                    return message.get("result")
+                elif kind == "error":
+                    print(
+                        f"Smoke test failed with status {message.get('status_code')}: "
+                        f"{message.get('detail')}",
+                        file=sys.stderr,
+                    )
+                    return None
+        print("Smoke test stream ended without a final result", file=sys.stderr)
+        return None
     except requests.RequestException as exc:
         print(f"Smoke test request error: {exc}", file=sys.stderr)
         return None
@@ -325,31 +421,25 @@ def main() -> None:
     print(f"Using API root: {API_ROOT}")
     wait_for_api()
 
-    print("Upserting DialogFlow CX tool...")
-    tool_id = upsert_tool()
+    print("Upserting DialogFlow CX tool and creating fresh network...")
+    tool_id, network_id = run_concurrently(upsert_tool, recreate_network)
     print(f"Tool ready (id={tool_id})")
-
-    print("Creating fresh network...")
-    network_id = recreate_network()
     print(f"Network id={network_id}")
 
     print("Attaching tool to network...")
     network_tool_id = add_tool_to_network(network_id)
     print(f"Network tool id={network_tool_id}")
 
-    print("Creating agents...")
-    primary_agent_id, evaluator_agent_id = create_agents(network_id)
-    print(f"Primary agent id={primary_agent_id}, evaluator id={evaluator_agent_id}")
-
-    print("Equipping primary agent with DialogFlow tool...")
-    equip_agent(network_id, primary_agent_id)
-
-    print("Configuring agent routing graph...")
-    set_agent_routes(network_id, primary_agent_id, [EVAL_AGENT_KEY])
-    set_agent_routes(network_id, evaluator_agent_id, [])
-
-    print("Publishing network version...")
-    publish_network(network_id)
+    print("Creating agents, wiring tools/routes and publishing...")
+    agent_ids = apply_network_spec(network_id)
+    if agent_ids is None:
+        print("API has no /apply endpoint; falling back to per-resource calls.")
+        agent_ids = wire_agents_per_endpoint(network_id)
+    primary_agent_id, evaluator_agent_id = agent_ids
+    if evaluator_agent_id is None:
+        print(f"Primary agent id={primary_agent_id} (no evaluator)")
+    else:
+        print(f"Primary agent id={primary_agent_id}, evaluator id={evaluator_agent_id}")
     print("Network published.")
 
     if os.getenv("DIALOGFLOW_DEMO_SKIP_RUN"):
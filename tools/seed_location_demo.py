@@ -1,37 +1,51 @@
 #!/usr/bin/env python3
-import os
-import sys
-import requests
+from functools import lru_cache
 
-API = os.getenv("API_URL", "http://localhost:8000")
+from _api_client import API, ensure_ok, get, post, put, run_concurrently
 
+SUN_AGENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "lat": {"type": ["number", "string"]},
+        "lng": {"type": ["number", "string"]},
+    },
+    "required": ["lat", "lng"],
+    "additionalProperties": False,
+}
+GEONAMES_AGENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "q": {"type": "string", "minLength": 1},
+        "maxRows": {"type": "integer", "minimum": 1, "default": 10},
+        "featureClass": {"type": "string"},
+    },
+    "required": ["q"],
+    "additionalProperties": False,
+}
 
-def post(path: str, json):
-    return requests.post(f"{API}{path}", json=json)
 
+@lru_cache(maxsize=None)
+def _existing_tool_keys():
+    """Keys of the global tools that already exist, so reruns skip their POSTs."""
+    return {t["key"] for t in ensure_ok(get("/config/tools"))}
 
-def put(path: str, json):
-    return requests.put(f"{API}{path}", json=json)
 
+@lru_cache(maxsize=None)
+def _networks_by_name():
+    """Existing networks keyed by name, fetched once per run for the 409 paths."""
+    return {n["name"]: n for n in ensure_ok(get("/config/networks"))}
 
-def get(path: str):
-    return requests.get(f"{API}{path}")
 
+@lru_cache(maxsize=None)
+def _agents_by_key(net_id):
+    """Existing agents of a network keyed by agent key, fetched once per run."""
+    return {a["key"]: a for a in ensure_ok(get(f"/config/networks/{net_id}/agents"))}
 
-def ensure_ok(r, expected=200):
-    if r.status_code != expected:
-        print(
-            f"Error {r.status_code} for {r.request.method} {r.request.url}: {r.text}",
-            file=sys.stderr,
-        )
-        r.raise_for_status()
-    return r.json() if r.content else {}
-
-
-def main():
-    print(f"Using API: {API}")
 
-    # Create or ensure global tools: sun and geonames
+def ensure_sun_tool():
+    if "sun" in _existing_tool_keys():
+        print("Global tool 'sun' already exists")
+        return
     print("Ensuring global tool 'sun'...")
     r = post(
         "/config/tools",
@@ -52,21 +66,19 @@ def main():
                     "query": {"lat": {"source": "agent"}, "lng": {"source": "agent"}},
                     "response": {"unwrap": "results"},
                 },
-                "agent_params_json_schema": {
-                    "type": "object",
-                    "properties": {
-                        "lat": {"type": ["number", "string"]},
-                        "lng": {"type": ["number", "string"]},
-                    },
-                    "required": ["lat", "lng"],
-                    "additionalProperties": False,
-                },
+                "agent_params_json_schema": SUN_AGENT_SCHEMA,
             },
         },
     )
     if r.status_code not in (201, 409):
-        ensure_ok(r, 201)
+        ensure_ok(r, 201, parse=False)
+    _existing_tool_keys().add("sun")
 
+
+def ensure_geonames_tool():
+    if "geonames" in _existing_tool_keys():
+        print("Global tool 'geonames' already exists")
+        return
     print("Creating global tool 'geonames'...")
     r = post(
         "/config/tools",
@@ -94,23 +106,22 @@ def main():
                     },
                     "response": {"keys": ["totalResultsCount", "geonames"]},
                 },
-                "agent_params_json_schema": {
-                    "type": "object",
-                    "properties": {
-                        "q": {"type": "string", "minLength": 1},
-                        "maxRows": {"type": "integer", "minimum": 1, "default": 10},
-                        "featureClass": {"type": "string"},
-                    },
-                    "required": ["q"],
-                    "additionalProperties": False,
-                },
+                "agent_params_json_schema": GEONAMES_AGENT_SCHEMA,
             },
         },
     )
     if r.status_code not in (201, 409):
-        ensure_ok(r, 201)
+        ensure_ok(r, 201, parse=False)
+    _existing_tool_keys().add("geonames")
+
+
+def ensure_tools():
+    _existing_tool_keys()  # one GET up front; only missing tools are POSTed
+    run_concurrently(ensure_sun_tool, ensure_geonames_tool)
 
-    # Create a network
+
+def ensure_network():
+    """Create the demo network; returns (id, created)."""
     print("Creating network 'locations_demo'...")
     r = post(
         "/config/networks",
@@ -121,26 +132,46 @@ def main():
     )
     if r.status_code == 409:
         # Lookup id
-        net_id = next(
-            (
-                n["id"]
-                for n in ensure_ok(get("/config/networks"))
-                if n["name"] == "locations_demo"
-            ),
-            None,
-        )
-        if not net_id:
+        network = _networks_by_name().get("locations_demo")
+        if not network:
             raise SystemExit("Could not resolve existing network 'locations_demo'")
-    else:
-        net_id = ensure_ok(r, 201)["id"]
-    print("Network id:", net_id)
+        return network["id"], False
+    return ensure_ok(r, 201)["id"], True
+
 
-    # Add tools to this network
-    ensure_ok(
+def ensure_agent(net_id, payload, existing=None):
+    """Create an agent unless ``existing`` already has it, falling back on 409."""
+    if existing and payload["key"] in existing:
+        return existing[payload["key"]]
+    resp = post(f"/config/networks/{net_id}/agents", json=payload)
+    if resp.status_code == 201:
+        return resp.json()
+    if resp.status_code != 409:
+        return ensure_ok(resp, 201)
+    # Fetch existing
+    agent = _agents_by_key(net_id).get(payload["key"])
+    if agent:
+        return agent
+    agent = ensure_ok(
         post(
-            f"/config/networks/{net_id}/tools", json={"tool_keys": ["sun", "geonames"]}
-        )
+            f"/config/networks/{net_id}/agents",
+            json={"key": payload["key"], "allow_respond": payload["allow_respond"]},
+        ),
+        201,
     )
+    _agents_by_key(net_id)[agent["key"]] = agent
+    return agent
+
+
+def main():
+    print(f"Using API: {API}")
+
+    # Global tools and the network are independent; create them in parallel.
+    _, (net_id, created) = run_concurrently(ensure_tools, ensure_network)
+    print("Network id:", net_id)
+    # A reused network may already hold the agents; look them up once instead of
+    # POSTing into a 409.
+    existing_agents = {} if created else _agents_by_key(net_id)
 
     # Create agents
     triage_prompt = (
@@ -154,83 +185,56 @@ def main():
         "After each tool call, the conversation will be routed back to you with the tool response; decide next steps."
     )
 
-    tri_resp = post(
-        f"/config/networks/{net_id}/agents",
-        json={
+    # Add tools to this network while the RESPOND-capable agent is created; the
+    # API rejects a network whose first agent cannot respond, so triage follows.
+    _, location = run_concurrently(
+        lambda: ensure_ok(
+            post(
+                f"/config/networks/{net_id}/tools",
+                json={"tool_keys": ["sun", "geonames"]},
+            ),
+            parse=False,
+        ),
+        lambda: ensure_agent(
+            net_id,
+            {
+                "key": "location_details",
+                "display_name": "Location Details Agent",
+                "allow_respond": True,
+                "prompt_template": location_prompt,
+            },
+            existing_agents,
+        ),
+    )
+    triage = ensure_agent(
+        net_id,
+        {
             "key": "triage",
             "display_name": "Triage",
             "allow_respond": False,
             "is_default": True,
             "prompt_template": triage_prompt,
         },
+        existing_agents,
     )
-    if tri_resp.status_code == 201:
-        triage = tri_resp.json()
-    elif tri_resp.status_code == 409:
-        # Fetch existing
-        triage = next(
-            (
-                a
-                for a in ensure_ok(get(f"/config/networks/{net_id}/agents"))
-                if a["key"] == "triage"
-            ),
-            None,
-        )
-        if not triage:
-            triage = ensure_ok(
-                post(
-                    f"/config/networks/{net_id}/agents",
-                    json={"key": "triage", "allow_respond": False},
-                ),
-                201,
-            )
-    else:
-        ensure_ok(tri_resp, 201)
 
-    loc_resp = post(
-        f"/config/networks/{net_id}/agents",
-        json={
-            "key": "location_details",
-            "display_name": "Location Details Agent",
-            "allow_respond": True,
-            "prompt_template": location_prompt,
-        },
-    )
-    if loc_resp.status_code == 201:
-        location = loc_resp.json()
-    elif loc_resp.status_code == 409:
-        location = next(
-            (
-                a
-                for a in ensure_ok(get(f"/config/networks/{net_id}/agents"))
-                if a["key"] == "location_details"
+    run_concurrently(
+        # Equip tools to location_details
+        lambda: ensure_ok(
+            put(
+                f"/config/networks/{net_id}/agents/{location['id']}/tools",
+                json={"tool_keys": ["sun", "geonames"]},
             ),
-            None,
-        )
-        if not location:
-            location = ensure_ok(
-                post(
-                    f"/config/networks/{net_id}/agents",
-                    json={"key": "location_details", "allow_respond": True},
-                ),
-                201,
-            )
-    else:
-        ensure_ok(loc_resp, 201)
-
-    # Equip tools to location_details
-    ensure_ok(
-        put(
-            f"/config/networks/{net_id}/agents/{location['id']}/tools",
-            json={"tool_keys": ["sun", "geonames"]},
-        )
-    )
-    # Triage routes to location_details
-    ensure_ok(
-        put(
-            f"/config/networks/{net_id}/agents/{triage['id']}/routes",
-            json={"agent_keys": ["location_details"]},
-        )
+            parse=False,
+        ),
+        # Triage routes to location_details
+        lambda: ensure_ok(
+            put(
+                f"/config/networks/{net_id}/agents/{triage['id']}/routes",
+                json={"agent_keys": ["location_details"]},
+            ),
+            parse=False,
+        ),
     )
 
     # Publish
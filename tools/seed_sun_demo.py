@@ -1,54 +1,65 @@
 #!/usr/bin/env python3
 import json
 import os
-import sys
 import time
+from functools import lru_cache
 import requests
 
+from _api_client import (
+    API,
+    SESSION,
+    delete,
+    ensure_ok,
+    get,
+    post,
+    put,
+    run_concurrently,
+)
+
 # This script seeds the database using the new SQLModel-based API.
 
-API = os.getenv("API_URL", "http://localhost:8000")
 SNAPSHOT_FILE = os.path.join(os.path.dirname(__file__), "sun_snapshot.json")
 NETWORK_NAME = "sun_demo_from_snapshot"
 
 
-def post(path: str, json_data):
-    return requests.post(f"{API}{path}", json=json_data)
-
-
-def put(path: str, json_data):
-    return requests.put(f"{API}{path}", json=json_data)
+@lru_cache(maxsize=None)
+def _networks_by_name():
+    """Existing networks keyed by name, fetched once per run."""
+    return {n["name"]: n for n in ensure_ok(get("/config/networks"))}
 
 
-def get(path: str):
-    return requests.get(f"{API}{path}")
+def create_tool(tool_data):
+    tool_data["additional_data"] = tool_data.pop("metadata", {})
+    r = post("/config/tools", json=tool_data)
+    if r.status_code not in (201, 409):
+        ensure_ok(r, 201, parse=False)
 
 
-def delete(path: str):
-    return requests.delete(f"{API}{path}")
-
-
-def ensure_ok(r, expected=(200, 201, 204)):
-    if not isinstance(expected, (list, tuple)):
-        expected = (expected,)
-    if r.status_code not in expected:
-        print(
-            f"Error {r.status_code} for {r.request.method} {r.request.url}: {r.text}",
-            file=sys.stderr,
-        )
-        r.raise_for_status()
-    return r.json() if r.content else {}
+def create_missing_tools(tools):
+    # One GET of the global tools, so reruns skip POSTs that would only 409.
+    existing = {t["key"] for t in ensure_ok(get("/config/tools"))}
+    missing = [t for t in tools if t["key"] not in existing]
+    for tool_data in tools:
+        if tool_data["key"] in existing:
+            print(f"Tool '{tool_data['key']}' already exists")
+    run_concurrently(*[lambda t=tool_data: create_tool(t) for tool_data in missing])
 
 
 def main():
-    # Wait for API to be available
-    for _ in range(10):
+    # Wait for API to be available: back off from 50 ms up to 1 s, ~20 s in total.
+    delay = 0.05
+    for _ in range(25):
         try:
-            if get("/health").status_code == 200:
+            # HEAD skips the body; APIs without HEAD support answer 405, so GET instead.
+            r = SESSION.head(f"{API}/health")
+            if r.status_code == 405:
+                r = get("/health")
+            if r.status_code == 200:
                 break
         except requests.ConnectionError:
             pass
-        time.sleep(2)
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
     else:
         raise SystemExit("API did not become available in time.")
 
@@ -58,28 +69,26 @@ def main():
     with open(SNAPSHOT_FILE, "r", encoding="utf-8") as f:
         snapshot = json.load(f)
 
-    # 1. Clean up previous network if it exists
-    print(f"Checking for and cleaning up existing network '{NETWORK_NAME}'...")
-    try:
-        nets = ensure_ok(get("/config/networks"))
-        for n in nets:
-            if n["name"] == NETWORK_NAME:
-                print(f"Deleting network {n['id']}...")
-                ensure_ok(delete(f"/config/networks/{n['id']}"), 204)
-    except Exception as e:
-        print(f"Cleanup failed, assuming first run: {e}")
-
-    # 2. Create all tools from the snapshot
+    # 1. Clean up previous network if it exists. Deleting the network cascades to
+    # its agents, and the global tools don't depend on it, so 2. tool creation
+    # runs alongside the cleanup.
+    def cleanup():
+        print(f"Checking for and cleaning up existing network '{NETWORK_NAME}'...")
+        try:
+            existing = _networks_by_name().get(NETWORK_NAME)
+            if existing:
+                print(f"Deleting network {existing['id']}...")
+                ensure_ok(delete(f"/config/networks/{existing['id']}"), 204, parse=False)
+                _networks_by_name.cache_clear()
+        except Exception as e:
+            print(f"Cleanup failed, assuming first run: {e}")
+
     print("Creating tools from snapshot...")
-    for tool_data in snapshot.get("tools", []):
-        tool_data["additional_data"] = tool_data.pop("metadata", {})
-        r = post("/config/tools", json_data=tool_data)
-        if r.status_code not in (201, 409):
-            ensure_ok(r, 201)
+    run_concurrently(cleanup, lambda: create_missing_tools(snapshot.get("tools", [])))
 
     # 3. Create the network
     print(f"Creating network '{NETWORK_NAME}'...")
-    net = ensure_ok(post("/config/networks", json_data={"name": NETWORK_NAME}), 201)
+    net = ensure_ok(post("/config/networks", json={"name": NETWORK_NAME}), 201)
     net_id = net["id"]
     print(f"Network id: {net_id}")
 
@@ -88,14 +97,16 @@ def main():
     if tool_keys:
         print(f"Adding tools to network: {tool_keys}")
         ensure_ok(
-            post(f"/config/networks/{net_id}/tools", json_data={"tool_keys": tool_keys})
+            post(f"/config/networks/{net_id}/tools", json={"tool_keys": tool_keys}),
+            parse=False,
         )
 
     # 5. Create all agents from the snapshot
     print("Creating agents from snapshot...")
     agent_ids = {}
     agents_from_snapshot = snapshot.get("agents", [])
-    for agent_data in agents_from_snapshot:
+
+    def create_agent(agent_data):
         # The API now expects the Agent SQLModel directly.
         # We need to prepare the payload accordingly.
         agent_payload = {
@@ -104,13 +115,20 @@ def main():
             "is_default": agent_data["key"] == snapshot.get("default_agent_key"),
             "additional_data": {"prompt_template": agent_data.get("prompt", "")},
         }
-        agent = ensure_ok(
-            post(f"/config/networks/{net_id}/agents", json_data=agent_payload), 201
+        return ensure_ok(
+            post(f"/config/networks/{net_id}/agents", json=agent_payload), 201
         )
-        agent_ids[agent["key"]] = agent["id"]
+
+    # The API rejects a network without a RESPOND-capable agent, so those go first.
+    responders = [a for a in agents_from_snapshot if a["allow_respond"]]
+    others = [a for a in agents_from_snapshot if not a["allow_respond"]]
+    for batch in (responders, others):
+        for agent in run_concurrently(*[lambda a=a: create_agent(a) for a in batch]):
+            agent_ids[agent["key"]] = agent["id"]
 
     # 6. Equip agents with tools and set routes
     print("Configuring agent tools and routes...")
+    updates = []
     for agent_data in agents_from_snapshot:
         agent_key = agent_data["key"]
         agent_id = agent_ids[agent_key]
@@ -118,22 +136,29 @@ def main():
         equipped_tools = agent_data.get("equipped_tools", [])
         if equipped_tools:
             print(f"Equipping agent '{agent_key}' with tools: {equipped_tools}")
-            ensure_ok(
-                put(
-                    f"/config/networks/{net_id}/agents/{agent_id}/tools",
-                    json_data={"tool_keys": equipped_tools},
+            updates.append(
+                lambda agent_id=agent_id, tools=equipped_tools: ensure_ok(
+                    put(
+                        f"/config/networks/{net_id}/agents/{agent_id}/tools",
+                        json={"tool_keys": tools},
+                    ),
+                    parse=False,
                 )
             )
 
         allowed_routes = agent_data.get("allowed_routes", [])
         if allowed_routes:
             print(f"Setting routes for agent '{agent_key}': {allowed_routes}")
-            ensure_ok(
-                put(
-                    f"/config/networks/{net_id}/agents/{agent_id}/routes",
-                    json_data={"agent_keys": allowed_routes},
+            updates.append(
+                lambda agent_id=agent_id, routes=allowed_routes: ensure_ok(
+                    put(
+                        f"/config/networks/{net_id}/agents/{agent_id}/routes",
+                        json={"agent_keys": routes},
+                    ),
+                    parse=False,
                 )
             )
+    run_concurrently(*updates)
 
     print("Seed complete. Skipping publish step as it is under refactoring.")
 
@@ -11,18 +11,31 @@ from __future__ import annotations
 import json
 import os
 import sys
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
 
 import requests
 
-API_URL = os.getenv("API_URL", "http://localhost:8000")
+from _api_client import API as API_URL, SESSION
+
 SERVICE_URL = os.getenv("RAG_SERVICE_URL", "http://localhost:7100")
 COLLECTION = os.getenv("RAG_COLLECTION", "city_activities")
 NETWORK_NAME = os.getenv("RAG_NETWORK", "locations_demo")
 TOOL_KEY = os.getenv("RAG_TOOL_KEY", "city_rag")
 
-SESSION = requests.Session()
+
+# Shared by the tool's top-level and rag-specific schema slots.
+CITY_RAG_AGENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "query": {"type": "string", "minLength": 1},
+        "top_k": {"type": "integer", "minimum": 1},
+        "filter": {"type": "object"},
+    },
+    "required": ["query"],
+    "additionalProperties": False,
+}
 
 
 @dataclass
@@ -42,16 +55,7 @@ TOOL_SPEC = ToolSpec(
             "filter": {"source": "agent"},
         },
         "additional_data": {
-            "agent_params_json_schema": {
-                "type": "object",
-                "properties": {
-                    "query": {"type": "string", "minLength": 1},
-                    "top_k": {"type": "integer", "minimum": 1},
-                    "filter": {"type": "object"},
-                },
-                "required": ["query"],
-                "additionalProperties": False,
-            },
+            "agent_params_json_schema": CITY_RAG_AGENT_SCHEMA,
             "rag": {
                 "service": {
                     "base_url": SERVICE_URL,
@@ -59,25 +63,28 @@ TOOL_SPEC = ToolSpec(
                     "timeout": 20,
                     "default_payload": {"collection": COLLECTION},
                 },
-                "agent_params_json_schema": {
-                    "type": "object",
-                    "properties": {
-                        "query": {"type": "string", "minLength": 1},
-                        "top_k": {"type": "integer", "minimum": 1},
-                        "filter": {"type": "object"},
-                    },
-                    "required": ["query"],
-                    "additionalProperties": False,
-                },
+                "agent_params_json_schema": CITY_RAG_AGENT_SCHEMA,
             },
         },
     }
 )
 
 
-def _request(method: str, path: str, **kwargs) -> requests.Response:
+# Static request bodies, encoded once.
+_TOOL_PAYLOAD_JSON = json.dumps(TOOL_SPEC.payload).encode()
+_EMPTY_OBJECT_JSON = b"{}"
+
+
+def _request(
+    method: str,
+    path: str,
+    *,
+    json: Any = None,
+    data: Optional[bytes] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> requests.Response:
     url = f"{API_URL.rstrip('/')}/{path.lstrip('/')}"
-    resp = SESSION.request(method, url, **kwargs)
+    resp = SESSION.request(method, url, json=json, data=data, headers=headers)
     if resp.status_code >= 400:
         raise RuntimeError(f"{method} {url} failed: {resp.status_code} {resp.text}")
     return resp
@@ -88,74 +95,91 @@ def ensure_tool(spec: ToolSpec) -> None:
     tools = resp.json()
     if any(t.get("key") == spec.payload["key"] for t in tools):
         return
-    _request(
-        "POST",
-        "/config/tools",
-        headers={"Content-Type": "application/json"},
-        data=json.dumps(spec.payload),
-    )
+    data = _TOOL_PAYLOAD_JSON if spec is TOOL_SPEC else json.dumps(spec.payload).encode()
+    _request("POST", "/config/tools", data=data)
 
 
-def find_network_id(name: str) -> Optional[int]:
-    resp = _request("GET", "/config/networks")
-    for net in resp.json():
+@dataclass
+class NetworkBundle:
+    id: int
+    agents_by_key: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    tool_keys: Set[str] = field(default_factory=set)
+
+
+def fetch_network_bundle(
+    name: str, networks: Optional[List[Dict[str, Any]]] = None
+) -> Optional[NetworkBundle]:
+    """Resolve a network by name and load its agents and tools from one /graph call.
+
+    Pass ``networks`` when the /config/networks listing was already fetched.
+    """
+    if networks is None:
+        networks = _request("GET", "/config/networks").json()
+    network_id = None
+    for net in networks:
         if net.get("name") == name:
-            return net.get("id")
-    return None
+            network_id = net.get("id")
+            break
+    if network_id is None:
+        return None
+    graph = _request("GET", f"/config/networks/{network_id}/graph").json()
+    return NetworkBundle(
+        id=network_id,
+        agents_by_key={a["key"]: a for a in graph.get("agents", [])},
+        tool_keys={t["key"] for t in graph.get("tools", [])},
+    )
 
 
-def attach_tool(network_id: int, key: str) -> None:
-    _request(
-        "POST",
-        f"/config/networks/{network_id}/tools",
-        headers={"Content-Type": "application/json"},
-        data=json.dumps({"tool_keys": [key]}),
-    )
+def attach_tool(bundle: NetworkBundle, key: str) -> None:
+    if key in bundle.tool_keys:
+        return
+    _request("POST", f"/config/networks/{bundle.id}/tools", json={"tool_keys": [key]})
+    bundle.tool_keys.add(key)
 
 
-def equip_agent(network_id: int, tool_keys: list[str]) -> None:
-    agents = _request("GET", f"/config/networks/{network_id}/agents").json()
-    # pick location_details or the first agent that allows respond
-    target = None
-    for agent in agents:
-        if agent.get("key") == "location_details":
-            target = agent
-            break
-    if not target and agents:
-        target = agents[0]
+def equip_agent(bundle: NetworkBundle, tool_keys: list[str]) -> None:
+    # pick location_details or the first agent in the network
+    target = bundle.agents_by_key.get("location_details")
+    if not target and bundle.agents_by_key:
+        target = next(iter(bundle.agents_by_key.values()))
     if not target:
         raise RuntimeError("No agents found in network")
+    if set(target.get("equipped_tools") or []) == set(tool_keys):
+        return
     agent_id = target["id"]
     _request(
         "PUT",
-        f"/config/networks/{network_id}/agents/{agent_id}/tools",
-        headers={"Content-Type": "application/json"},
-        data=json.dumps({"tool_keys": tool_keys}),
+        f"/config/networks/{bundle.id}/agents/{agent_id}/tools",
+        json={"tool_keys": tool_keys},
     )
+    target["equipped_tools"] = list(tool_keys)
 
 
-def publish_network(network_id: int) -> None:
+def publish_network(bundle: NetworkBundle) -> None:
     _request(
         "POST",
-        f"/config/networks/{network_id}/versions/compile_and_publish",
-        headers={"Content-Type": "application/json"},
-        data="{}",
+        f"/config/networks/{bundle.id}/versions/compile_and_publish",
+        data=_EMPTY_OBJECT_JSON,
     )
 
 
 def main() -> None:
-    ensure_tool(TOOL_SPEC)
-    net_id = find_network_id(NETWORK_NAME)
-    if net_id is None:
+    # The network listing does not depend on the tool; fetch it while ensure_tool runs.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        networks_future = executor.submit(_request, "GET", "/config/networks")
+        ensure_tool(TOOL_SPEC)
+        networks = networks_future.result().json()
+    bundle = fetch_network_bundle(NETWORK_NAME, networks)
+    if bundle is None:
         raise RuntimeError(f"Network '{NETWORK_NAME}' not found")
-    attach_tool(net_id, TOOL_KEY)
-    equip_agent(net_id, [
+    attach_tool(bundle, TOOL_KEY)
+    equip_agent(bundle, [
         "sun",
         "geonames",
         TOOL_KEY,
     ])
-    publish_network(net_id)
-    print(json.dumps({"network_id": net_id, "tool": TOOL_KEY}, indent=2))
+    publish_network(bundle)
+    print(json.dumps({"network_id": bundle.id, "tool": TOOL_KEY}, indent=2))
 
 
 if __name__ == "__main__":
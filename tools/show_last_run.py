@@ -2,46 +2,188 @@
 """Display the latest /run artifact with prompts, LLM output, tool calls, and final response."""
 
 import json
+import os
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+
+# ijson (in requirements.txt) streams the displayed fields out of large artifacts;
+# without it the whole file is loaded instead.
+try:
+    import ijson
+except ImportError:  # pragma: no cover - dependency guard
+    ijson = None
 
 RUNS_DIR = Path(__file__).resolve().parent.parent / "logs" / "runs"
+# Artifacts run to several MB; read them in large binary chunks with no text decoding.
+_READ_BUFFER = 1 << 20
+_NUMBER = (int, float)
+
+# Keys read from the artifact, either under "response" or (legacy) at the top level.
+RUN_FIELDS = (
+    "final",
+    "execution_log",
+    "debug",
+    "tool_log",
+    "latency",
+    "llm_usage_totals",
+    "run_duration_ms",
+)
+# Non-empty containers that are streamed entry by entry rather than materialised
+# up front, mapped to the parser event that opens them.
+_STREAMED_FIELDS = {"debug": "start_array", "tool_log": "start_map"}
+_VALUE_START_EVENTS = {"start_map", "start_array", "map_key"}
+
+
+def _iter_items(path: Path, prefix: str) -> Iterator[Any]:
+    with path.open("rb", buffering=_READ_BUFFER) as f:
+        yield from ijson.items(f, prefix, use_float=True)
+
+
+class _StreamedMap:
+    """Lazy stand-in for a JSON object; ``items()`` re-reads it one entry at a time."""
+
+    def __init__(self, path: Path, prefix: str) -> None:
+        self._path = path
+        self._prefix = prefix
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        with self._path.open("rb", buffering=_READ_BUFFER) as f:
+            yield from ijson.kvitems(f, self._prefix, use_float=True)
+
+
+def _extract_run_fields(path: Path, f: BinaryIO) -> Dict[str, Any]:
+    """Build only RUN_FIELDS in one pass; every other value is skipped unbuilt."""
+    data: Dict[str, Any] = {}
+    parser = ijson.parse(f, use_float=True)
+    for prefix, event, key in parser:
+        if event != "map_key" or prefix not in ("", "response") or key not in RUN_FIELDS:
+            continue
+        target = data if not prefix else data.setdefault("response", {})
+        value_path = f"{prefix}.{key}" if prefix else key
+        _, first_event, first_value = next(parser)
+        streamable = _STREAMED_FIELDS.get(key) == first_event
+        streamed = False
+        builder = ijson.ObjectBuilder()
+        builder.event(first_event, first_value)
+        if first_event in _VALUE_START_EVENTS:
+            for sub_prefix, sub_event, sub_value in parser:
+                closes = sub_prefix == value_path and sub_event not in _VALUE_START_EVENTS
+                # Only non-empty containers are streamed, so empty ones stay falsy
+                # for the top-level fallback and print as before.
+                if streamable and not closes:
+                    streamed = True
+                if not streamed:
+                    builder.event(sub_event, sub_value)
+                if closes:
+                    break
+        if not streamed:
+            target[key] = builder.value
+        elif first_event == "start_array":
+            target[key] = _iter_items(path, f"{value_path}.item")
+        else:
+            target[key] = _StreamedMap(path, value_path)
+    return data
+
+
+@lru_cache(maxsize=1)
+def _latest_artifact_name(dir_key: Tuple[int, int]) -> Optional[str]:
+    """Newest run_*.json name; ``dir_key`` is (inode, mtime_ns) of RUNS_DIR.
+
+    Adding or removing an artifact bumps the directory mtime, so repeated calls
+    on an unchanged directory (e.g. when polled) skip the scan entirely.
+    """
+    # Artifact names sort chronologically, so one pass tracking the max name
+    # replaces globbing and sorting the whole directory.
+    latest_name = None
+    with os.scandir(RUNS_DIR) as entries:
+        for entry in entries:
+            name = entry.name
+            if (
+                name.startswith("run_")
+                and name.endswith(".json")
+                and (latest_name is None or name > latest_name)
+            ):
+                latest_name = name
+    return latest_name
 
 
 def _load_latest() -> Dict[str, Any]:
-    files = sorted(RUNS_DIR.glob("run_*.json"))
-    if not files:
+    try:
+        st = os.stat(RUNS_DIR)
+        latest_name = _latest_artifact_name((st.st_ino, st.st_mtime_ns))
+    except FileNotFoundError:
+        latest_name = None
+    if latest_name is None:
         raise SystemExit("No run artifacts found in logs/runs")
-    latest = files[-1]
-    with latest.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    latest = RUNS_DIR / latest_name
+    with latest.open("rb", buffering=_READ_BUFFER) as f:
+        data: Optional[Dict[str, Any]] = None
+        strict = True
+        if ijson is not None:
+            try:
+                data = _extract_run_fields(latest, f)
+            except ijson.JSONError:
+                f.seek(0)
+        if data is None:
+            data, strict = _load_whole(f)
     data["_file"] = str(latest)
+    data["_strict_json"] = strict
     return data
 
 
+def _load_whole(f: BinaryIO) -> Tuple[Dict[str, Any], bool]:
+    """Decode the whole artifact, returning it and whether it was strict JSON.
+
+    The API writes artifacts with ``json.dump``, which allows NaN/Infinity and
+    ints wider than 64 bits; ijson rejects both, so the stdlib decoder is used.
+    """
+    constants: List[str] = []
+
+    def _constant(name: str) -> float:
+        constants.append(name)
+        return float(name)
+
+    return json.loads(f.read(), parse_constant=_constant), not constants
+
+
 def _print_header(title: str) -> None:
     print(f"\n=== {title} ===")
 
 
+def _print_json(value: Any, strict: bool = True) -> None:
+    """Pretty-print ``value`` as JSON through the same text stream as print().
+
+    orjson writes NaN/Infinity as null and cannot encode ints wider than 64 bits,
+    so values from non-strict artifacts go through the stdlib encoder instead.
+    """
+    if strict:
+        try:
+            sys.stdout.write(
+                orjson.dumps(
+                    value, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+                ).decode()
+            )
+            return
+        except orjson.JSONEncodeError:
+            pass
+    print(json.dumps(value, indent=2, ensure_ascii=False))
+
+
 def main() -> None:
     payload = _load_latest()
     print(f"File: {payload['_file']}")
-    final = payload.get("response", {}).get("final") or payload.get("final")
-    exec_log = payload.get("response", {}).get("execution_log") or payload.get(
-        "execution_log"
-    )
-    debug = payload.get("response", {}).get("debug") or payload.get("debug")
-    tool_log = payload.get("response", {}).get("tool_log") or payload.get("tool_log")
-    latency = payload.get("response", {}).get("latency") or payload.get("latency")
-    llm_totals = payload.get("response", {}).get("llm_usage_totals") or payload.get(
-        "llm_usage_totals"
-    )
-    run_duration_ms = payload.get("response", {}).get("run_duration_ms") or payload.get(
-        "run_duration_ms"
+    strict = payload["_strict_json"]
+    resp = payload.get("response") or {}
+    final, exec_log, debug, tool_log, latency, llm_totals, run_duration_ms = (
+        resp.get(key) or payload.get(key) for key in RUN_FIELDS
     )
 
     _print_header("Final Response")
-    print(json.dumps(final, indent=2))
+    _print_json(final, strict)
 
     if latency:
         steps = latency.get("steps") or []
@@ -58,23 +200,25 @@ def main() -> None:
             tool_total_ms = item.get("tool_total_duration_ms")
             tool_key = item.get("tool_key")
             tool_status = item.get("tool_status")
-            parts = []
-            if isinstance(duration_ms, (int, float)):
-                parts.append(f"total={duration_ms / 1000.0:.3f}s")
-            if isinstance(llm_ms, (int, float)):
-                parts.append(f"llm={llm_ms / 1000.0:.3f}s")
+            tool_part = None
             if tool_key:
-                if isinstance(tool_ms, (int, float)):
-                    parts.append(f"tool={tool_ms / 1000.0:.3f}s")
-                elif isinstance(tool_total_ms, (int, float)):
-                    parts.append(f"tool≈{tool_total_ms / 1000.0:.3f}s")
-                if tool_status:
-                    parts.append(f"tool_status={tool_status}")
-            if item.get("routed_to_agent"):
-                parts.append(f"routed_to={item['routed_to_agent']}")
-            if item.get("result_status") and not tool_status:
-                parts.append(f"status={item['result_status']}")
-            detail = ", ".join(parts) if parts else "no timing data"
+                if isinstance(tool_ms, _NUMBER):
+                    tool_part = f"tool={tool_ms / 1000.0:.3f}s"
+                elif isinstance(tool_total_ms, _NUMBER):
+                    tool_part = f"tool≈{tool_total_ms / 1000.0:.3f}s"
+            routed_to = item.get("routed_to_agent")
+            result_status = item.get("result_status")
+            parts = (
+                f"total={duration_ms / 1000.0:.3f}s"
+                if isinstance(duration_ms, _NUMBER)
+                else None,
+                f"llm={llm_ms / 1000.0:.3f}s" if isinstance(llm_ms, _NUMBER) else None,
+                tool_part,
+                f"tool_status={tool_status}" if tool_key and tool_status else None,
+                f"routed_to={routed_to}" if routed_to else None,
+                f"status={result_status}" if result_status and not tool_status else None,
+            )
+            detail = ", ".join(p for p in parts if p) or "no timing data"
             print(f"Step {step_num} ({agent} → {action}): {detail}")
         if isinstance(total_ms, (int, float)):
             print(f"Total Run Time: {total_ms / 1000.0:.3f}s")
@@ -91,7 +235,10 @@ def main() -> None:
             parts.append(f"response={response}")
         if isinstance(total, int):
             parts.append(f"total={total}")
-        print(", ".join(parts) if parts else json.dumps(llm_totals, indent=2))
+        if parts:
+            print(", ".join(parts))
+        else:
+            _print_json(llm_totals, strict)
 
     if isinstance(run_duration_ms, int):
         _print_header("Run Duration")
@@ -99,21 +246,26 @@ def main() -> None:
         print(f"{run_duration_ms} ms ({seconds:.3f}s)")
 
     _print_header("Execution Log")
-    print(json.dumps(exec_log, indent=2))
+    _print_json(exec_log, strict)
 
     _print_header("LLM Prompts & Raw Responses")
+    # Prompts and raw outputs are the bulk of an artifact; write them straight
+    # through rather than building concatenated copies.
     for entry in debug or []:
         print(f"\nAgent: {entry.get('agent')}")
-        print("Prompt:\n" + entry.get("prompt", ""))
-        print("Raw:\n" + entry.get("raw", ""))
+        sys.stdout.write("Prompt:\n")
+        sys.stdout.write(entry.get("prompt", ""))
+        sys.stdout.write("\nRaw:\n")
+        sys.stdout.write(entry.get("raw", ""))
+        sys.stdout.write("\n")
 
     _print_header("Tool Calls")
-    if isinstance(tool_log, dict):
+    if isinstance(tool_log, (dict, _StreamedMap)):
         for key, info in tool_log.items():
             print(f"\nExecution ID: {key}")
-            print(json.dumps(info, indent=2))
+            _print_json(info, strict)
     else:
-        print(json.dumps(tool_log, indent=2))
+        _print_json(tool_log, strict)
 
 
 if __name__ == "__main__":
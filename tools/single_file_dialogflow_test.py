@@ -1,14 +1,66 @@
 #!/usr/bin/env python3
-"""Single-file test script for DialogFlow CX API."""
+"""Single-file test script for DialogFlow CX API.
 
+Pass utterances as arguments to test several at once; each gets its own session
+and the sessions run concurrently over one async client.
+"""
+
+import asyncio
 import json
+import sys
 import uuid
-from google.cloud import dialogflowcx_v3
-from google.oauth2 import service_account
-from google.protobuf.json_format import MessageToDict
 
-def run_dialogflow_test():
-    """Initializes a client and sends a test query to DialogFlow CX."""
+PROJECT_ID = "satacs-be-prd"
+LOCATION = "global"
+AGENT_ID = "fde810bf-b9fb-4924-85be-2aab8b4896e1"
+ENVIRONMENT = "draft"
+LANGUAGE_CODE = "en"
+WARMUP_QUERY = "ewc"
+
+
+def _detect_intent_request(session_path, text, query_params):
+    from google.cloud import dialogflowcx_v3
+
+    return dialogflowcx_v3.DetectIntentRequest(
+        session=session_path,
+        query_input=dialogflowcx_v3.QueryInput(
+            text=dialogflowcx_v3.TextInput(text=text),
+            language_code=LANGUAGE_CODE,
+        ),
+        query_params=query_params,
+    )
+
+
+async def _run_session(client, utterance, query_params):
+    """Send the warmup message, then ``utterance``, within one fresh session."""
+    from google.protobuf.json_format import MessageToJson
+
+    session_id = uuid.uuid4().hex
+    session_path = (
+        f"projects/{PROJECT_ID}/locations/{LOCATION}/agents/{AGENT_ID}/"
+        f"environments/{ENVIRONMENT}/sessions/{session_id}"
+    )
+    print(f"Constructed Session Path: {session_path}")
+
+    # Turns within a session are ordered, so only distinct sessions overlap.
+    results = []
+    for text in dict.fromkeys([WARMUP_QUERY, utterance]):
+        response = await client.detect_intent(
+            request=_detect_intent_request(session_path, text, query_params)
+        )
+        results.append(
+            (text, MessageToJson(response._pb, preserving_proto_field_name=True, indent=2))
+        )
+    return results
+
+
+async def run_dialogflow_test(utterances=(WARMUP_QUERY,)):
+    """Initializes a client and sends test queries to DialogFlow CX."""
+    # The Google SDK (grpc, protobuf stubs, auth) is slow to import; load it only
+    # once a test actually runs.
+    from google.cloud import dialogflowcx_v3
+    from google.oauth2 import service_account
+
     try:
         # 1. Load Credentials
         with open(".secrets/dialogflow_service_account.json") as f:
@@ -16,26 +68,13 @@ def run_dialogflow_test():
         credentials = service_account.Credentials.from_service_account_info(service_account_info)
         print("Successfully loaded credentials.")
 
-        # 2. Define Parameters
-        project_id = "satacs-be-prd"
-        location = "global"
-        agent_id = "fde810bf-b9fb-4924-85be-2aab8b4896e1"
-        environment = "draft"
-        language_code = "en"
-        session_id = uuid.uuid4().hex
-        print(f"Using Session ID: {session_id}")
-
-        # 3. Create Client and Session Path
-        client_options = {"api_endpoint": f"{location}-dialogflow.googleapis.com"}
-        client = dialogflowcx_v3.SessionsClient(credentials=credentials, client_options=client_options)
-
-        session_path = (
-            f"projects/{project_id}/locations/{location}/agents/{agent_id}/"
-            f"environments/{environment}/sessions/{session_id}"
+        # 2. Create one async client shared by every session
+        client_options = {"api_endpoint": f"{LOCATION}-dialogflow.googleapis.com"}
+        client = dialogflowcx_v3.SessionsAsyncClient(
+            credentials=credentials, client_options=client_options
         )
-        print(f"Constructed Session Path: {session_path}")
 
-        # 4. Define Session Parameters
+        # 3. Define Session Parameters
         session_params = {
             "customer_verified": "true",
             "username": "CSTESTINR",
@@ -43,23 +82,17 @@ def run_dialogflow_test():
         query_params = dialogflowcx_v3.QueryParameters(parameters=session_params)
         print(f"Using Session Parameters: {session_params}")
 
-        # 5. Send Initial "ewc" Message
-        ewc_query = "ewc"
-        request = dialogflowcx_v3.DetectIntentRequest(
-            session=session_path,
-            query_input=dialogflowcx_v3.QueryInput(
-                text=dialogflowcx_v3.TextInput(text=ewc_query),
-                language_code=language_code,
-            ),
-            query_params=query_params,
+        # 4. Send every utterance concurrently, one session each
+        print(f"\nSending {len(utterances)} utterance(s)...")
+        sessions = await asyncio.gather(
+            *(_run_session(client, u, query_params) for u in utterances)
         )
-        print(f"\nSending initial message: '{ewc_query}'...")
-        response = client.detect_intent(request=request)
-        print("Initial message sent successfully.")
-        response_dict = MessageToDict(response._pb, preserving_proto_field_name=True)
-        print("\n--- Response to 'ewc' ---")
-        print(json.dumps(response_dict, indent=2))
-        print("--------------------------")
+        print("Messages sent successfully.")
+        for results in sessions:
+            for text, response_json in results:
+                print(f"\n--- Response to '{text}' ---")
+                print(response_json)
+                print("--------------------------")
 
     except Exception as e:
         print(f"\nAn error occurred: {e}")
@@ -67,4 +100,4 @@ def run_dialogflow_test():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    run_dialogflow_test()
+    asyncio.run(run_dialogflow_test(sys.argv[1:] or (WARMUP_QUERY,)))
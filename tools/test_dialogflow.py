@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Test script for DialogFlow CX tool."""
 
+import asyncio
 import os
 import sys
 import json
@@ -9,13 +10,15 @@ from typing import Any, Dict
 # Add the src directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from arion_agents.tools.dialogflow import DialogFlowCXTool
-from arion_agents.tools.base import ToolConfig, ToolRunInput
-from google.oauth2 import service_account
-from google.cloud import dialogflowcx_v3
 
 def main():
     """Run a test of the DialogFlowCXTool."""
+    # The DialogFlow tool pulls in the Google SDK (grpc, protobuf stubs, auth),
+    # which is slow to import; load it only once a test actually runs.
+    from arion_agents.tools.dialogflow import DialogFlowCXTool
+    from arion_agents.tools.base import ToolConfig, ToolRunInput
+    from google.oauth2 import service_account
+
     with open(".secrets/dialogflow_service_account.json") as f:
         service_account_info = json.load(f)
     
@@ -42,18 +45,27 @@ def main():
         "dialogflow_environment": "draft", # This is the parameter causing the issue
     }
 
-    agent_params = {"query": "Am I allowed to have multiple accounts?"}
-
-    tool_input = ToolRunInput(
-        params=agent_params,
-        system=system_params,
-        metadata={},
-    )
-
-    result = tool.run(tool_input)
+    queries = sys.argv[1:] or ["Am I allowed to have multiple accounts?"]
 
-    print(json.dumps(result.dict(), indent=2))
+    # Each query runs in its own session (the tool records session state in its
+    # system params), so the blocking detect_intent calls can overlap.
+    async def run_all():
+        return await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    tool.run,
+                    ToolRunInput(
+                        params={"query": query},
+                        system=dict(system_params),
+                        metadata={},
+                    ),
+                )
+                for query in queries
+            )
+        )
 
+    for result in asyncio.run(run_all()):
+        print(json.dumps(result.dict(), indent=2))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file